@@ -18,5 +18,11 @@ class Settings:
         origins = os.getenv("ALLOWED_ORIGINS", "")
         return [origin.strip() for origin in origins.split(",") if origin.strip()]
 
+    # X-Forwarded-For를 신뢰할 프록시 주소 (쉼표로 구분, 비어 있으면 헤더를 사용하지 않음)
+    @property
+    def TRUSTED_PROXIES(self) -> List[str]:
+        proxies = os.getenv("TRUSTED_PROXIES", "")
+        return [proxy.strip() for proxy in proxies.split(",") if proxy.strip()]
+
 # 전역에서 사용할 설정 인스턴스
 settings = Settings()
\ No newline at end of file
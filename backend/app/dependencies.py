@@ -1,20 +1,41 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
+import time
 from app.config import settings
 from app.database import get_db_pool
+from app.services.user_cache import user_cache, token_cache
 
 security = HTTPBearer()
 
+def decode_token(token: str) -> dict:
+    """JWT 서명/만료 검증 (검증된 토큰은 만료 전까지 캐시하여 재검증 생략)"""
+    payload = token_cache.get(token, None)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(token, payload, ttl=min(token_cache.ttl, remaining))
+    return payload
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """JWT 토큰에서 현재 사용자 정보 추출"""
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token(credentials.credentials)
         user_id: str = payload.get("sub")
         user_uid: int = payload.get("user_uid")
         
         if user_id is None or user_uid is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+
+        # 캐시된 사용자 정보 사용 (사용자 수정/삭제 시 무효화됨)
+        cached = user_cache.get(user_uid, None)
+        if cached is not None and cached["user_id"] == user_id:
+            return dict(cached)
+        # 조회 중 사용자 변경(권한 변경/삭제)으로 무효화되면 조회 결과를 캐시하지 않도록 세대 기록
+        generation = user_cache.generation
         
         # 데이터베이스에서 사용자 정보 조회
         db_pool = get_db_pool()
@@ -27,12 +48,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             if not user_row:
                 raise HTTPException(status_code=401, detail="User not found")
             
-            return {
+            user = {
                 "user_uid": user_row['user_uid'],
                 "user_id": user_row['user_id'],
                 "user_name": user_row['user_name'],
                 "user_level": user_row['user_level']
             }
+            user_cache.set(user_uid, user, generation=generation)
+            return dict(user)
             
     except jwt.PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
@@ -8,15 +8,66 @@ import os
 
 from app.config import settings
 from app.database import init_db_pool, close_db_pool, get_db_pool
+from app.migrations import run_migrations, check_query_plans
 from app.routers import auth, flow, websocket, admin, ai
 from app.middleware.security import SecurityMiddleware
 from app.services.ai_data_service import ai_data_service
+from app.services.realtime_publisher import realtime_publisher
+from app.services.event_bus import (
+    event_bus, TOPIC_REALTIME_KPI, TOPIC_ALERT, TOPIC_REFERENCE_CHANGED, TOPIC_INTERVAL_SAVED,
+    TOPIC_USER_CHANGED, TOPIC_LOGIN_THROTTLE
+)
+from app.services.reference_cache import on_reference_changed
+from app.services.user_cache import on_user_changed
+from app.services.data_versions import data_versions
+from app.services.partition_maintenance import partition_maintenance
+from app.services.status_monitor import status_monitor
+from app.utils.rate_limiter import login_throttle
+from app.services.audit_writer import audit_writer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 서버 시작 시
     await init_db_pool()
+
+    # 스키마 마이그레이션 (테이블/인덱스 DDL은 여기서만 실행)
+    await run_migrations()
+    if os.getenv("DB_EXPLAIN_CHECK", "true").lower() == "true":
+        try:
+            await check_query_plans()
+        except Exception as e:
+            print(f"실행 계획 점검 실패 (계속 진행): {e}")
+
+    # 감사 로그 배치 기록 시작
+    audit_writer.start()
+
+    # 워커 간 이벤트 버스 시작 (수신한 이벤트를 이 워커의 WebSocket 클라이언트로 중계)
+    event_bus.subscribe(TOPIC_REALTIME_KPI, realtime_publisher.relay_event)
+    event_bus.subscribe(TOPIC_ALERT, websocket.relay_alert_event)
+    event_bus.subscribe(TOPIC_REFERENCE_CHANGED, on_reference_changed)
+    event_bus.subscribe(TOPIC_USER_CHANGED, on_user_changed)
+    event_bus.subscribe(TOPIC_LOGIN_THROTTLE, login_throttle.on_throttle_event)
+    # 조회 API 조건부 응답(ETag)용 버전 갱신
+    event_bus.subscribe(TOPIC_ALERT, data_versions.on_alert_changed)
+    event_bus.subscribe(TOPIC_REFERENCE_CHANGED, data_versions.on_reference_changed)
+    event_bus.subscribe(TOPIC_INTERVAL_SAVED, data_versions.on_interval_saved)
+    try:
+        await event_bus.start()
+    except Exception as e:
+        print(f"이벤트 버스 시작 실패 (계속 진행): {e}")
+
+    # WebSocket heartbeat 및 끊어진 연결 정리 시작
+    websocket.manager.start_heartbeat()
+
+    # flow_detail_info 월 파티션 생성/보관 기간 정리
+    partition_maintenance.start()
+
+    # 시스템 상태 스냅샷 주기적 갱신 (/api/status, /api/health)
+    status_monitor.start()
+
+    # 로그인 잠금 스냅샷 복원 및 주기적 저장
+    login_throttle.start()
     
     # AI 서비스 자동 시작
     try:
@@ -33,6 +84,15 @@ async def lifespan(app: FastAPI):
         print("AI 데이터 서비스 중지됨")
     except Exception as e:
         print(f"AI 서비스 중지 중 오류: {e}")
+
+    await login_throttle.stop()
+    await status_monitor.stop()
+    await partition_maintenance.stop()
+    await websocket.manager.stop_heartbeat()
+    await event_bus.stop()
+
+    # 남은 감사 로그 기록 (DB 풀 종료 전)
+    await audit_writer.stop()
     
     await close_db_pool()
 
@@ -69,7 +129,7 @@ app.add_middleware(
         "X-Requested-With",
         "X-CSRF-Token"
     ],
-    expose_headers=["X-Total-Count"]
+    expose_headers=["X-Total-Count", "ETag", "Last-Modified"]
 )
 
 # 라우터 등록
@@ -94,4 +154,6 @@ if __name__ == "__main__":
 
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8001"))
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # WebSocket permessage-deflate 압축 (클라이언트가 지원하면 협상됨)
+    ws_per_message_deflate = os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+    uvicorn.run(app, host=host, port=port, ws_per_message_deflate=ws_per_message_deflate)
\ No newline at end of file
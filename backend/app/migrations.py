@@ -0,0 +1,256 @@
+# app/migrations.py
+"""스키마 마이그레이션 및 인덱스 관리
+
+서버 시작 시 main.lifespan에서 한 번 실행된다. 적용된 버전은 schema_version 테이블에 기록되며,
+여러 워커가 동시에 시작해도 advisory lock으로 한 워커만 마이그레이션을 적용한다.
+새 DDL은 기존 항목을 수정하지 않고 MIGRATIONS 끝에 새 버전으로 추가한다.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from app.database import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+# 마이그레이션 실행 중임을 나타내는 advisory lock 키 (임의의 고정값)
+MIGRATION_LOCK_KEY = 72_410_001
+
+# 순차 적용되는 마이그레이션 (version, 설명, SQL 목록) - 각 버전은 하나의 트랜잭션으로 적용
+# ("transactional": False이면 CREATE INDEX CONCURRENTLY IF NOT EXISTS 문장을 하나씩 실행)
+MIGRATIONS: List[Dict] = [
+    {
+        "version": 1,
+        "description": "감사 로그 테이블",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS audit_logs (
+                id SERIAL PRIMARY KEY,
+                event_type VARCHAR(100) NOT NULL,
+                user_id VARCHAR(100),
+                ip_address INET,
+                user_agent TEXT,
+                details JSONB,
+                level VARCHAR(20) DEFAULT 'INFO',
+                resource VARCHAR(200),
+                created_at TIMESTAMP DEFAULT NOW()
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_audit_user_time ON audit_logs(user_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_ip_time ON audit_logs(ip_address, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_event_type ON audit_logs(event_type)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_created_at ON audit_logs(created_at)",
+        ],
+    },
+    {
+        "version": 2,
+        "description": "조회 경로 인덱스 (알람 페이지네이션, 카메라 목록)",
+        # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 문장별로 실행 (인덱스 생성 중에도 쓰기가 막히지 않음)
+        # flow_detail_info 인덱스는 v3의 파티션 테이블에서 생성
+        "transactional": False,
+        "statements": [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alert_uid_date ON alert_info(flow_uid, alert_date DESC, alert_uid DESC)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_camera_flow_name ON camera_info(flow_uid, camera_name)",
+        ],
+    },
+    {
+        "version": 3,
+        "description": "flow_detail_info 월 단위 범위 파티셔닝",
+        "statements": [
+            # 기존 테이블을 파티션 테이블로 교체한다 (이미 파티션 테이블이면 건너뜀)
+            # 테이블 이름 변경과 빈 파티션 생성만 수행하므로 데이터 양과 관계없이 바로 끝난다.
+            # 기존 데이터는 flow_detail_info_legacy에 남아 있다가 PartitionMaintenance가 배치 단위로 옮긴다.
+            """
+            DO $$
+            DECLARE
+                month_start DATE := date_trunc('month', NOW())::date;
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'flow_detail_info' AND relkind = 'p') THEN
+                    RETURN;
+                END IF;
+
+                ALTER TABLE flow_detail_info RENAME TO flow_detail_info_legacy;
+                ALTER INDEX IF EXISTS flow_detail_info_pkey RENAME TO flow_detail_info_legacy_pkey;
+                ALTER INDEX IF EXISTS idx_flow_detail_uid_time RENAME TO idx_flow_detail_legacy_uid_time;
+
+                CREATE TABLE flow_detail_info (
+                    id BIGINT NOT NULL DEFAULT nextval('flow_detail_info_id_seq'),
+                    flow_uid BIGINT REFERENCES flow_info(flow_uid),
+                    flow_rate DECIMAL(10,2),
+                    flow_flux DECIMAL(10,2),
+                    flow_waterlevel DECIMAL(10,2),
+                    flow_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (id, flow_time)
+                ) PARTITION BY RANGE (flow_time);
+                ALTER SEQUENCE flow_detail_info_id_seq OWNED BY flow_detail_info.id;
+
+                -- 범위를 벗어난 행을 받아 주는 기본 파티션 (정상 운영 시 비어 있음)
+                CREATE TABLE flow_detail_info_default PARTITION OF flow_detail_info DEFAULT;
+
+                -- 이번 달 파티션 (이후 달은 PartitionMaintenance가 미리 생성)
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF flow_detail_info FOR VALUES FROM (%L) TO (%L)',
+                    'flow_detail_info_' || to_char(month_start, 'YYYYMM'),
+                    month_start, (month_start + INTERVAL '1 month')::date
+                );
+            END
+            $$
+            """,
+            # 파티션 테이블 인덱스 (각 파티션에 자동 생성)
+            "CREATE INDEX IF NOT EXISTS idx_flow_detail_uid_time ON flow_detail_info(flow_uid, flow_time DESC)",
+        ],
+    },
+    {
+        "version": 4,
+        "description": "지점별 일별 통계 테이블",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS flow_daily_stats (
+                flow_uid BIGINT NOT NULL REFERENCES flow_info(flow_uid) ON DELETE CASCADE,
+                stat_date DATE NOT NULL,
+                sample_count INTEGER NOT NULL,
+                min_level DOUBLE PRECISION,           -- 최저 수위 (cm)
+                max_level DOUBLE PRECISION,           -- 최고 수위 (cm)
+                avg_level DOUBLE PRECISION,           -- 평균 수위 (cm)
+                p95_level DOUBLE PRECISION,           -- 95백분위 수위 (cm)
+                peak_velocity DOUBLE PRECISION,       -- 최대 유속 (m/s)
+                discharge_volume DOUBLE PRECISION,    -- 총 유출량 (m³)
+                minutes_above_warning INTEGER,        -- 주의 수위 초과 시간 (분)
+                minutes_above_danger INTEGER,         -- 위험 수위 초과 시간 (분)
+                updated_at TIMESTAMP DEFAULT NOW(),
+                PRIMARY KEY (flow_uid, stat_date)
+            )
+            """,
+        ],
+    },
+    {
+        "version": 5,
+        "description": "로그인 잠금 스냅샷 테이블",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS login_lockouts (
+                throttle_key VARCHAR(200) PRIMARY KEY,   -- user:<아이디> 또는 ip:<주소>
+                locked_until TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            )
+            """,
+        ],
+    },
+    {
+        "version": 6,
+        "description": "이벤트 버스 발행 순서 시퀀스 (워커 간 WebSocket 재개 번호)",
+        "statements": [
+            "CREATE SEQUENCE IF NOT EXISTS event_bus_seq",
+        ],
+    },
+]
+
+def hot_queries() -> List[Tuple[str, str, tuple]]:
+    """실행 계획을 점검할 주요 조회 쿼리 (이름, SQL, 예시 인자) - 실제 조회와 같은 SQL 상수 사용"""
+    from app.services.flow_service import (
+        LATEST_FLOW_QUERY, TIMESERIES_QUERY, RECENT_ALERTS_QUERY, LATEST_LOOKBACK, floor_to_minute
+    )
+    now = datetime.now()
+    return [
+        ("latest_flow_data", LATEST_FLOW_QUERY, (1, floor_to_minute(now - LATEST_LOOKBACK))),
+        ("timeseries_range", TIMESERIES_QUERY, (1, floor_to_minute(now - timedelta(days=7)))),
+        ("recent_alerts", RECENT_ALERTS_QUERY, (1, 11)),
+    ]
+
+# 이 행 수보다 작은 테이블은 순차 스캔이 정상이므로 경고하지 않음
+SEQSCAN_WARN_MIN_ROWS = int(os.getenv("DB_SEQSCAN_WARN_MIN_ROWS", "10000"))
+
+
+async def _create_index_concurrently(conn, statement: str):
+    """트랜잭션 밖에서 인덱스 생성 - 이전 실행이 중간에 끊겨 INVALID 인덱스가 남아 있으면 지우고 다시 생성"""
+    index_name = statement.split(" IF NOT EXISTS ", 1)[1].split()[0]
+    invalid = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = $1 AND NOT i.indisvalid
+        )
+    """, index_name)
+    if invalid:
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+    await conn.execute(statement)
+
+
+async def run_migrations() -> List[int]:
+    """적용되지 않은 마이그레이션을 순서대로 적용하고 적용한 버전 목록 반환"""
+    db_pool = get_db_pool()
+    applied_now = []
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+        try:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP DEFAULT NOW()
+                )
+            """)
+            applied = {row['version'] for row in await conn.fetch("SELECT version FROM schema_version")}
+
+            for migration in MIGRATIONS:
+                if migration["version"] in applied:
+                    continue
+                if migration.get("transactional", True):
+                    async with conn.transaction():
+                        for statement in migration["statements"]:
+                            await conn.execute(statement)
+                        await conn.execute(
+                            "INSERT INTO schema_version (version, description) VALUES ($1, $2)",
+                            migration["version"], migration["description"]
+                        )
+                else:
+                    for statement in migration["statements"]:
+                        await _create_index_concurrently(conn, statement)
+                    await conn.execute(
+                        "INSERT INTO schema_version (version, description) VALUES ($1, $2)",
+                        migration["version"], migration["description"]
+                    )
+                applied_now.append(migration["version"])
+                logger.info(f"마이그레이션 적용: v{migration['version']} {migration['description']}")
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+    return applied_now
+
+
+def _find_seq_scans(plan: Dict) -> List[str]:
+    """실행 계획 트리에서 Seq Scan 대상 테이블 수집"""
+    relations = []
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        relations.extend(_find_seq_scans(child))
+    return relations
+
+
+async def check_query_plans() -> Dict[str, List[str]]:
+    """주요 조회 쿼리를 EXPLAIN 하여 큰 테이블의 순차 스캔을 경고 (인덱스 누락 감지용)"""
+    db_pool = get_db_pool()
+    findings = {}
+
+    async with db_pool.acquire() as conn:
+        for name, query, args in hot_queries():
+            try:
+                raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *args)
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            except Exception as e:
+                logger.warning(f"실행 계획 점검 실패 ({name}): {e}")
+                continue
+
+            for relation in _find_seq_scans(plan):
+                row_estimate = await conn.fetchval(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = $1", relation
+                )
+                if row_estimate is not None and row_estimate >= SEQSCAN_WARN_MIN_ROWS:
+                    findings.setdefault(name, []).append(relation)
+                    logger.warning(
+                        f"순차 스캔 감지 ({name}): {relation} 약 {row_estimate}행 - 인덱스를 확인하세요"
+                    )
+
+    return findings
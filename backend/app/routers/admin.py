@@ -1,11 +1,18 @@
 # app/routers/admin.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, List
 from pydantic import BaseModel
 from app.utils.audit_logger import AuditLogger
 from app.dependencies import get_current_user
 from app.database import get_db_pool
+from app.services.reference_cache import invalidate_reference
+from app.services.daily_stats import backfill_daily_stats
+from app.services.data_versions import data_versions, RESOURCE_TIMESERIES
+from app.services.event_bus import event_bus, TOPIC_INTERVAL_SAVED
+from app.services.audit_writer import audit_writer
+from app.utils.auth_utils import password_hasher
+from app.utils.rate_limiter import login_throttle
 
 router = APIRouter()
 
@@ -88,6 +95,9 @@ async def create_monitoring_point(
             point.flow_region, point.flow_address
             )
 
+            # 참조 데이터 캐시 무효화
+            await invalidate_reference([flow_uid])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "MONITORING_POINT_CREATED",
@@ -139,6 +149,9 @@ async def update_monitoring_point(
             point.flow_longitude, point.flow_region, point.flow_address
             )
 
+            # 참조 데이터 캐시 무효화
+            await invalidate_reference([flow_uid])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "MONITORING_POINT_UPDATED",
@@ -180,20 +193,23 @@ async def delete_monitoring_point(
             if not existing:
                 raise HTTPException(status_code=404, detail="지점을 찾을 수 없습니다.")
 
-            # 관련 데이터 확인
-            data_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM flow_detail_info WHERE flow_uid = $1", flow_uid
+            # 관련 데이터 확인 (건수 대신 존재 여부만 - 인덱스 1건 조회로 끝남)
+            has_data = await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM flow_detail_info WHERE flow_uid = $1)", flow_uid
             )
 
-            if data_count > 0:
+            if has_data:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"이 지점에는 {data_count}개의 측정 데이터가 있어 삭제할 수 없습니다."
+                    detail="이 지점에는 측정 데이터가 있어 삭제할 수 없습니다."
                 )
 
             # 지점 삭제 (CASCADE로 카메라 정보도 함께 삭제됨)
             await conn.execute("DELETE FROM flow_info WHERE flow_uid = $1", flow_uid)
 
+            # 참조 데이터 캐시 무효화
+            await invalidate_reference([flow_uid])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "MONITORING_POINT_DELETED",
@@ -285,6 +301,9 @@ async def create_camera(
             camera.flow_uid, camera.camera_ip, camera.camera_name
             )
 
+            # 참조 데이터 캐시 무효화
+            await invalidate_reference([camera.flow_uid])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "CAMERA_CREATED",
@@ -354,6 +373,9 @@ async def update_camera(
             camera_uid, camera.flow_uid, camera.camera_ip, camera.camera_name
             )
 
+            # 참조 데이터 캐시 무효화 (지점이 바뀐 경우 이전 지점 포함)
+            await invalidate_reference([existing['flow_uid'], camera.flow_uid])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "CAMERA_UPDATED",
@@ -399,6 +421,9 @@ async def delete_camera(
             # 카메라 삭제
             await conn.execute("DELETE FROM camera_info WHERE camera_uid = $1", camera_uid)
 
+            # 참조 데이터 캐시 무효화
+            await invalidate_reference([existing['flow_uid']])
+
             # 감사 로그
             await AuditLogger.log_event(
                 "CAMERA_DELETED",
@@ -496,30 +521,10 @@ async def get_audit_statistics(
     try:
         start_date = datetime.now() - timedelta(days=days)
         
-        logs = await AuditLogger.get_audit_logs(
-            start_date=start_date,
-            limit=10000  # 통계용이므로 많이 조회
-        )
-        
-        # 통계 계산
-        stats = {
-            "total_events": len(logs),
-            "login_success": len([l for l in logs if l.get("event_type") == AuditLogger.LOGIN_SUCCESS]),
-            "login_failure": len([l for l in logs if l.get("event_type") == AuditLogger.LOGIN_FAILURE]),
-            "security_events": len([l for l in logs if l.get("level") == AuditLogger.SECURITY]),
-            "unique_users": len(set(l.get("user_id") for l in logs if l.get("user_id"))),
-            "unique_ips": len(set(l.get("ip_address") for l in logs if l.get("ip_address"))),
-            "period_days": days
-        }
-        
-        # 일별 통계
-        daily_stats = {}
-        for log in logs:
-            if log.get("created_at"):
-                date_key = log["created_at"].date().isoformat()
-                if date_key not in daily_stats:
-                    daily_stats[date_key] = 0
-                daily_stats[date_key] += 1
+        # 통계 계산 (DB 집계 - 로그 행을 가져오지 않음)
+        stats = await AuditLogger.get_audit_statistics(start_date)
+        daily_stats = stats.pop("daily_events")
+        stats["period_days"] = days
         
         return {
             "status": "success",
@@ -677,4 +682,50 @@ async def update_notification_settings(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"알림 설정 업데이트 실패: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"알림 설정 업데이트 실패: {str(e)}")
+
+# 일별 통계 백필
+@router.post("/daily-stats/backfill")
+async def backfill_daily_stats_endpoint(
+    flow_uid: Optional[int] = Query(None, description="하천 UID (생략 시 전체 지점)"),
+    start: Optional[date] = Query(None, description="시작일 (생략 시 측정 이력 처음부터)"),
+    end: Optional[date] = Query(None, description="종료일 (생략 시 측정 이력 끝까지)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """과거 측정 이력으로 일별 통계 채우기 (관리자 권한 필요)"""
+    if current_user.get("user_level", 1) != 0:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
+
+    try:
+        result = await backfill_daily_stats(flow_uid, start, end)
+
+        # 조건부 응답 캐시가 새 통계를 반영하도록 시계열 버전 갱신 (모든 워커)
+        version = data_versions.bump(RESOURCE_TIMESERIES, flow_uid)
+        await event_bus.publish(TOPIC_INTERVAL_SAVED, {"flow_uid": flow_uid, "version": version})
+
+        await AuditLogger.log_event(
+            "DAILY_STATS_BACKFILL",
+            user_id=current_user["user_id"],
+            details={"flow_uid": flow_uid, **result},
+            level=AuditLogger.INFO
+        )
+
+        return {"status": "success", **result}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일별 통계 백필 실패: {str(e)}")
+
+# 보안 관련 백그라운드 상태
+@router.get("/security-status")
+async def get_security_status(current_user: dict = Depends(get_current_user)):
+    """비밀번호 해시 작업, 로그인 잠금, 감사 로그 기록기 상태 (관리자 권한 필요)"""
+    if current_user.get("user_level", 1) != 0:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
+
+    return {
+        "status": "success",
+        "password_hasher": password_hasher.get_stats(),
+        "login_throttle": login_throttle.get_stats(),
+        "audit_writer": audit_writer.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
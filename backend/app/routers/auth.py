@@ -4,6 +4,9 @@ from pydantic import BaseModel
 from app.services.auth_service import AuthService
 from app.dependencies import get_current_user
 from app.database import get_db_pool
+from app.services.reference_cache import reference_cache, MONITORING_POINTS_KEY
+from app.services.user_cache import invalidate_user
+from app.utils.rate_limiter import get_client_ip
 
 router = APIRouter()
 auth_service = AuthService()
@@ -12,13 +15,9 @@ auth_service = AuthService()
 @router.post("/login", response_model=LoginResponse)
 async def login(login_data: LoginRequest, request: Request):
     """사용자 로그인 (로그인 시도 제한 포함)"""
-    # 클라이언트 IP 추출
-    client_ip = request.client.host
-    
-    # X-Forwarded-For 헤더 확인 (프록시 환경)
-    if "x-forwarded-for" in request.headers:
-        client_ip = request.headers["x-forwarded-for"].split(",")[0].strip()
-    
+    # 클라이언트 IP 추출 (X-Forwarded-For는 TRUSTED_PROXIES에서 온 요청만 사용)
+    client_ip = get_client_ip(request)
+
     return await auth_service.authenticate_user(login_data, client_ip)
 
 
@@ -59,6 +58,12 @@ async def change_password(
 @router.get("/monitoring-points")
 async def get_available_monitoring_points(current_user: dict = Depends(get_current_user)):
     """flow_info 테이블에서 모니터링 지점 목록 조회"""
+    cached = reference_cache.get(MONITORING_POINTS_KEY, None)
+    if cached is not None:
+        return cached
+    # 조회 중 무효화되면 오래된 목록을 캐시하지 않도록 세대 기록
+    generation = reference_cache.generation
+
     try:
         db_pool = get_db_pool()
 
@@ -82,10 +87,12 @@ async def get_available_monitoring_points(current_user: dict = Depends(get_curre
                 for point in points
             ]
 
-            return {
+            result = {
                 "status": "success",
                 "monitoring_points": point_list
             }
+            reference_cache.set(MONITORING_POINTS_KEY, result, generation=generation)
+            return result
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"모니터링 지점 목록 조회 실패: {str(e)}")
@@ -174,19 +181,20 @@ async def update_user(
             else:
                 flow_uid_to_update = None  # 관리자는 담당지점 None
 
-
-            # 비밀번호가 제공된 경우 해시 처리
-            if user_data.password:
-                from app.utils.auth_utils import hash_password as hash_pwd
-                hashed_password = hash_pwd(user_data.password)
+        # 비밀번호가 제공된 경우 해시 처리 (연결을 반납한 뒤 수행 - bcrypt 동안 풀 연결을 잡지 않도록)
+        if user_data.password:
+            from app.utils.auth_utils import hash_password_async
+            hashed_password = await hash_password_async(user_data.password)
+            async with db_pool.acquire() as conn:
                 await conn.execute("""
                     UPDATE users
                     SET user_name = $1, user_level = $2, user_phone = $3, user_flow_uid = $4, user_pwd = $5
                     WHERE user_uid = $6
                 """, user_data.user_name, user_data.user_level, phone_to_update,
                     flow_uid_to_update, hashed_password, user_uid)
-            else:
-                # 비밀번호는 변경하지 않음
+        else:
+            # 비밀번호는 변경하지 않음
+            async with db_pool.acquire() as conn:
                 await conn.execute("""
                     UPDATE users
                     SET user_name = $1, user_level = $2, user_phone = $3, user_flow_uid = $4
@@ -194,10 +202,13 @@ async def update_user(
                 """, user_data.user_name, user_data.user_level, phone_to_update,
                     flow_uid_to_update, user_uid)
 
-            return {
-                "status": "success",
-                "message": "사용자 정보가 성공적으로 수정되었습니다"
-            }
+        # 인증 사용자 캐시 무효화 (권한 변경 즉시 반영)
+        await invalidate_user(user_uid)
+
+        return {
+            "status": "success",
+            "message": "사용자 정보가 성공적으로 수정되었습니다"
+        }
 
     except HTTPException:
         raise
@@ -244,6 +255,9 @@ async def delete_user(
             # 사용자 삭제
             await conn.execute("DELETE FROM users WHERE user_uid = $1", user_uid)
 
+            # 인증 사용자 캐시 무효화 (삭제된 사용자의 토큰 즉시 거부)
+            await invalidate_user(user_uid)
+
             return {
                 "status": "success",
                 "message": "사용자가 성공적으로 삭제되었습니다"
@@ -1,12 +1,40 @@
 # app/routers/flow.py
-from fastapi import APIRouter, HTTPException, Depends, Query, Form
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query, Form, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
 from typing import Optional
-from app.services.flow_service import FlowService
+from datetime import date, datetime, timedelta
+from app.services.flow_service import FlowService, to_local_naive, floor_to_minute
+from app.services.export_service import stream_flow_history, is_format_available, is_export_busy, MEDIA_TYPES
+from app.services.data_versions import (
+    data_versions, RESOURCE_TIMESERIES, RESOURCE_ALERTS, RESOURCE_INFO, RESOURCE_CAMERAS
+)
+from app.services.status_monitor import status_monitor, APP_VERSION
+from app.utils.audit_logger import AuditLogger
+from app.utils.rate_limiter import get_client_ip
 from app.dependencies import get_current_user
 
 router = APIRouter()
 flow_service = FlowService()
 
+def not_modified_response(
+        request: Request, response: Response, resource: str, flow_uid: Optional[int], window: Optional[str] = None
+) -> Optional[Response]:
+    """조건부 GET 처리 - 변경이 없으면 304 응답 반환 (조회/직렬화 생략), 아니면 ETag 헤더 설정
+
+    window: 현재 시각 기준 상대 구간(예: 최근 1시간)의 실제 구간 값. 지정하면 ETag에 포함되어
+    데이터 저장이 없어도 구간이 바뀌면 새 응답을 보내며, Last-Modified 기준 304는 사용하지 않는다.
+    """
+    variant = str(request.url.query) if window is None else f"{request.url.query}|{window}"
+    etag = data_versions.etag(resource, flow_uid, variant)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if window is None and not data_versions.local_ttl:
+        headers["Last-Modified"] = data_versions.last_modified(resource, flow_uid)
+    if data_versions.is_not_modified(request.headers, etag, resource, flow_uid, allow_since=window is None):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 @router.get("/realtime/{location_id}")
 async def get_realtime_data(
         location_id: str,
@@ -19,55 +47,205 @@ async def get_realtime_data(
 
 @router.get("/timeseries/{location_id}")
 async def get_timeseries_data(
+        request: Request,
+        response: Response,
         location_id: str,
         time_range: str = Query("7d", description="시간 범위: 1h, 6h, 12h, 24h, 7d"),
         flow_uid: int = Query(1, description="하천 UID"),
+        points: int = Query(200, ge=3, le=5000, description="반환할 최대 점 개수 (LTTB 다운샘플링)"),
+        format: str = Query("rows", pattern="^(rows|columnar)$", description="응답 형식: rows, columnar"),
+        packed: bool = Query(False, description="columnar 형식에서 배열을 base64 바이너리로 전송"),
+        start: Optional[datetime] = Query(None, description="구간 시작 (ISO 8601) - 지정 시 DB 버킷 집계"),
+        end: Optional[datetime] = Query(None, description="구간 종료 (ISO 8601, 기본값: 현재)"),
+        bucket: Optional[str] = Query(None, description="버킷 간격: 5m, 1h, 1d 등 (기본값: points 기준 자동)"),
         current_user: str = Depends(get_current_user)
 ):
-    """시계열 데이터 조회"""
+    """시계열 데이터 조회 (구간 저장 시 갱신되는 ETag로 조건부 응답)"""
+    # start/end를 모두 지정하지 않으면 현재 시각 기준 구간이므로 분 단위 구간 끝을 ETag에 포함
+    window = None if (start is not None and end is not None) else floor_to_minute(datetime.now()).isoformat()
+    not_modified = not_modified_response(request, response, RESOURCE_TIMESERIES, flow_uid, window)
+    if not_modified:
+        return not_modified
+
     service = FlowService(flow_uid)
-    return await service.get_timeseries_data(location_id, time_range)
+    if start is not None:
+        return await service.get_bucketed_timeseries(start, end, bucket, points)
+    return await service.get_timeseries_data(location_id, time_range, points, format, packed)
+
+@router.get("/stats/daily")
+async def get_daily_stats(
+        request: Request,
+        response: Response,
+        flow_uid: int = Query(1, description="하천 UID"),
+        start: Optional[date] = Query(None, description="시작일 (기본값: 1년 전)"),
+        end: Optional[date] = Query(None, description="종료일 (기본값: 오늘)"),
+        current_user: str = Depends(get_current_user)
+):
+    """일별 통계 조회 (최저/최고/평균/p95 수위, 최대 유속, 총 유출량, 주의/위험 초과 시간)"""
+    relative = start is None or end is None
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start는 end보다 이전이어야 합니다")
+
+    # 일별 통계는 구간 저장 시 함께 갱신되므로 시계열 버전을 사용 (기본 구간은 날짜가 바뀌면 달라짐)
+    window = f"{start.isoformat()}~{end.isoformat()}" if relative else None
+    not_modified = not_modified_response(request, response, RESOURCE_TIMESERIES, flow_uid, window)
+    if not_modified:
+        return not_modified
+
+    return await FlowService(flow_uid).get_daily_stats(start, end)
 
 @router.get("/alerts")
 async def get_alerts(
+        request: Request,
+        response: Response,
         limit: int = Query(10, ge=1, le=50, description="조회할 알람 개수"),
+        before: Optional[str] = Query(None, description="이전 페이지 커서 (응답의 next_cursor)"),
+        since: Optional[str] = Query(None, description="증분 조회 커서 - 이후 알람만 (응답의 latest_cursor)"),
         current_user: str = Depends(get_current_user)
 ):
-    """최근 알람 조회"""
-    return await flow_service.get_recent_alerts(limit)
+    """최근 알람 조회 (keyset 페이지네이션, 알람 추가/삭제 시 갱신되는 ETag로 조건부 응답)"""
+    not_modified = not_modified_response(request, response, RESOURCE_ALERTS, flow_service.flow_uid)
+    if not_modified:
+        return not_modified
+
+    return await flow_service.get_recent_alerts(limit, before, since)
 
 @router.get("/info")
 async def get_flow_info(
+        request: Request,
+        response: Response,
         current_user: str = Depends(get_current_user)
 ):
     """하천 정보 조회"""
+    not_modified = not_modified_response(request, response, RESOURCE_INFO, flow_service.flow_uid)
+    if not_modified:
+        return not_modified
+
     return await flow_service.get_flow_info()
 
 @router.get("/cameras/{flow_uid}")
 async def get_cameras(
+        request: Request,
+        response: Response,
         flow_uid: int,
         current_user: str = Depends(get_current_user)
 ):
     """특정 하천의 카메라 목록 조회"""
+    not_modified = not_modified_response(request, response, RESOURCE_CAMERAS, flow_uid)
+    if not_modified:
+        return not_modified
+
     return await flow_service.get_cameras_by_flow_uid(flow_uid)
 
+@router.get("/dashboard/{flow_uid}")
+async def get_dashboard_data(
+        flow_uid: int,
+        location_id: str = Query("center", description="위치 ID"),
+        time_range: str = Query("7d", description="시간 범위: 1h, 6h, 12h, 24h, 7d"),
+        points: int = Query(200, ge=3, le=5000, description="시계열 최대 점 개수 (LTTB 다운샘플링)"),
+        alert_limit: int = Query(10, ge=1, le=50, description="조회할 알람 개수"),
+        current_user: str = Depends(get_current_user)
+):
+    """대시보드 초기 데이터 일괄 조회
+
+    실시간/시계열/알람/하천 정보/카메라 목록을 서버에서 동시에 조회하여 한 번에 반환한다.
+    일부 항목이 실패해도 나머지는 반환하며, 실패한 항목은 status가 error로 표시된다.
+    """
+    service = FlowService(flow_uid)
+    sections = {
+        "realtime": service.get_latest_flow_data(location_id),
+        "timeseries": service.get_timeseries_data(location_id, time_range, points),
+        "alerts": service.get_recent_alerts(alert_limit),
+        "info": service.get_flow_info(),
+        "cameras": service.get_cameras_by_flow_uid(flow_uid),
+    }
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+    dashboard = {"flow_uid": flow_uid}
+    for name, result in zip(sections, results):
+        if isinstance(result, Exception):
+            detail = result.detail if isinstance(result, HTTPException) else str(result)
+            dashboard[name] = {"status": "error", "message": detail}
+        else:
+            dashboard[name] = result
+    dashboard["status"] = "success"
+    return dashboard
+
+@router.get("/stations/snapshot")
+async def get_stations_snapshot(
+        current_user: str = Depends(get_current_user)
+):
+    """전체 지점 현황 조회 (지도/지점 목록용 - 지점별 최신값과 경보 단계)"""
+    return await flow_service.get_stations_snapshot()
+
+@router.get("/export/flow-history")
+async def export_flow_history(
+        request: Request,
+        flow_uid: Optional[int] = Query(None, description="하천 UID (생략 시 전체 지점)"),
+        start: Optional[datetime] = Query(None, description="구간 시작 (ISO 8601)"),
+        end: Optional[datetime] = Query(None, description="구간 종료 (ISO 8601)"),
+        format: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="파일 형식: csv, parquet, arrow"),
+        current_user: dict = Depends(get_current_user)
+):
+    """측정 이력 내보내기 (서버 측 커서로 청크 단위 스트리밍)"""
+    if not is_format_available(format):
+        raise HTTPException(status_code=400, detail=f"{format} 형식을 사용하려면 서버에 pyarrow가 설치되어 있어야 합니다")
+    start = to_local_naive(start) if start else None
+    end = to_local_naive(end) if end else None
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start는 end보다 이전이어야 합니다")
+    if is_export_busy():
+        raise HTTPException(
+            status_code=503,
+            detail="진행 중인 내보내기가 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "10"}
+        )
+
+    client_ip = get_client_ip(request)
+
+    await AuditLogger.log_event(
+        AuditLogger.DATA_EXPORT,
+        user_id=current_user["user_id"],
+        ip_address=client_ip,
+        user_agent=request.headers.get("user-agent", ""),
+        details={
+            "flow_uid": flow_uid,
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "format": format
+        },
+        level=AuditLogger.INFO,
+        resource="/export/flow-history"
+    )
+
+    filename = f"flow_history_{flow_uid if flow_uid is not None else 'all'}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{format}"
+    return StreamingResponse(
+        stream_flow_history(format, flow_uid, start, end),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/status")
 async def get_system_status(
         current_user: str = Depends(get_current_user)
 ):
-    """시스템 상태 조회"""
+    """시스템 상태 조회 (주기적으로 갱신되는 상태 스냅샷 반환)"""
     try:
-        # 최신 데이터로 시스템 상태 확인
-        latest_data = await flow_service.get_latest_flow_data()
-        flow_info = await flow_service.get_flow_info()
+        snapshot = await status_monitor.get_snapshot()
 
         return {
             "status": "online",
-            "last_data_time": latest_data.get("flow_time"),
-            "monitoring_active": latest_data.get("status") == "success",
-            "connected_sites": 3,  # 입구, 중앙, 출구
-            "flow_name": flow_info.get("flow_name"),
-            "current_level": latest_data.get("flow_waterlevel", 0)
+            "last_data_time": snapshot.get("last_data_time"),
+            "monitoring_active": snapshot.get("data_status") == "success",
+            "connected_sites": snapshot.get("camera_count", 0),
+            "flow_name": snapshot.get("flow_name"),
+            "current_level": snapshot.get("current_level", 0),
+            "ai_connected": snapshot.get("ai_connected", False),
+            "buffer": snapshot.get("buffer"),
+            "database": snapshot.get("database"),
+            "updated_at": snapshot.get("updated_at")
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"시스템 상태 조회 실패: {str(e)}")
@@ -75,23 +253,15 @@ async def get_system_status(
 # 공개 엔드포인트 (인증 불필요)
 @router.get("/health")
 async def health_check():
-    """서버 상태 확인 (인증 불필요)"""
+    """서버 상태 확인 (인증 불필요, DB 조회 없이 상태 스냅샷 사용)"""
     try:
-        latest_data = await flow_service.get_latest_flow_data()
-
-        # 카메라 개수 조회
-        cameras_data = await flow_service.get_cameras_by_flow_uid(1)
-        connected_cameras = len(cameras_data.get("cameras", [])) if cameras_data.get("status") == "success" else 0
-
-        # AI 서버 연결 상태 확인
-        from app.services.ai_client import ai_client
-        ai_connected = ai_client.is_connected()
+        snapshot = await status_monitor.get_snapshot()
 
         return {
             "status": "healthy",
-            "monitoring_active": ai_connected,  # AI 서버 연결 상태로 판단
-            "connected_sites": connected_cameras,
-            "version": "1.0.0"
+            "monitoring_active": snapshot.get("ai_connected", False),  # AI 서버 연결 상태로 판단
+            "connected_sites": snapshot.get("camera_count", 0),
+            "version": APP_VERSION
         }
     except Exception as e:
         return {
@@ -101,6 +271,18 @@ async def health_check():
             "error": str(e)
         }
 
+@router.get("/health/live")
+async def liveness_probe():
+    """liveness 프로브 - 프로세스가 요청을 처리할 수 있으면 항상 200 (의존성 확인 없음)"""
+    return {"status": "alive"}
+
+@router.get("/health/ready")
+async def readiness_probe():
+    """readiness 프로브 - 최근 상태 스냅샷 기준 DB가 정상이면 200, 아니면 503"""
+    if not status_monitor.is_ready():
+        return JSONResponse(status_code=503, content={"status": "not_ready", **status_monitor.get_stats()})
+    return {"status": "ready", **status_monitor.get_stats()}
+
 @router.post("/alerts")
 async def add_alert(
         alert_message: str = Form(...),
@@ -1,60 +1,389 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from typing import Set, Dict, Any, Optional
+from collections import deque
 import json
+import os
+import time
+import uuid
 import asyncio
+import logging
 from datetime import datetime
+from app.utils.ws_protocol import (
+    CompactEncoder, PROTOCOL_JSON, PROTOCOL_COMPACT, ENCODING_JSON
+)
+from app.services.event_bus import event_bus
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 재연결 시 이어받을 수 있는 topic (아직 발행 전이어도 stream_info에 0번으로 알려 재개 기준점 제공)
+RESUMABLE_TOPICS = ("alert_update", "system_status", "realtime_kpi_update")
+# 최신값만 의미 있는 topic (재개 시 key별 마지막 메시지만 전송, 전체 재조회 요청 없음)
+CONFLATED_TOPICS = ("realtime_kpi_update",)
+
+def parse_last_seq(value: Optional[str]) -> Dict[str, int]:
+    """재연결 시 전달된 topic별 마지막 수신 번호 파싱 (예: "alert_update:12,realtime_kpi_update:340")"""
+    result = {}
+    for item in (value or "").split(","):
+        topic, _, seq = item.strip().rpartition(":")
+        if topic and seq.isdigit():
+            result[topic] = int(seq)
+    return result
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, replay_size: int = None):
+        self.active_connections: Set[WebSocket] = set()
+
+        # 서버 주도 heartbeat 설정 (초)
+        self.heartbeat_interval = float(os.getenv("WS_HEARTBEAT_INTERVAL", "20"))
+        self.heartbeat_timeout = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "60"))
+        self.send_timeout = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+        self.reaper_task: Optional[asyncio.Task] = None
+        self.reaped_count = 0
+
+        # 스트림 재개(resume)용 topic별 순번 및 재전송 버퍼
+        # postgres 이벤트 버스는 모든 워커에 같은 발행 번호(bus_seq)를 주므로 stream을 워커 간에 공유하고,
+        # 그 외에는 프로세스별 번호를 쓴다 (프로세스 재시작/다른 워커 재연결 시 클라이언트 전체 재조회)
+        self.shared = event_bus.shared_sequence
+        self.stream_id = f"bus-{event_bus.channel}" if self.shared else uuid.uuid4().hex[:12]
+        self.replay_size = replay_size or int(os.getenv("WS_REPLAY_BUFFER_SIZE", "500"))
+        self.sequences: Dict[str, int] = {}
+        self.replay_buffers: Dict[str, deque] = {}
+        self.evicted_upto: Dict[str, int] = {}  # topic -> 재전송 버퍼에서 밀려난 마지막 번호
+        self.conflated_topics = set(CONFLATED_TOPICS)
+        self.conflated_latest: Dict[str, Dict[Any, dict]] = {}  # topic -> {key: 마지막 메시지}
+
+    def _stamp(self, message: dict, seq: Optional[int] = None) -> dict:
+        """메시지에 topic별 순번을 부여하고 재전송 버퍼에 보관 (seq가 있으면 이벤트 버스 번호 사용)"""
+        topic = message.get("type")
+        if seq is None:
+            seq = self.sequences.get(topic, 0) + 1
+        self.sequences[topic] = max(self.sequences.get(topic, 0), seq)
+
+        stamped = dict(message)
+        stamped["seq"] = seq
+        buffer = self.replay_buffers.get(topic)
+        if buffer is None:
+            buffer = self.replay_buffers[topic] = deque(maxlen=self.replay_size)
+        if len(buffer) == buffer.maxlen:
+            self.evicted_upto[topic] = buffer[0]["seq"]
+        buffer.append(stamped)
+        return stamped
+
+    def _resume_floor(self, topic: str) -> Optional[int]:
+        """이 번호 이하의 메시지는 재전송할 수 없음 (None이면 놓친 메시지를 판단할 수 없음)"""
+        floor = self.evicted_upto.get(topic, 0)
+        if self.shared:
+            covered = event_bus.covered_since()
+            if covered is None:
+                return None
+            floor = max(floor, covered)
+        return floor
 
-    async def connect(self, websocket: WebSocket):
+    def _stream_seq(self) -> Dict[str, int]:
+        """stream_info로 알리는 topic별 현재 번호"""
+        seq = {topic: 0 for topic in RESUMABLE_TOPICS}
+        seq.update(self.sequences)
+        if self.shared:
+            # 다른 워커에서 받은 번호도 이 워커가 수신을 시작한 지점 이후면 이어받을 수 있음
+            covered = event_bus.covered_since() or 0
+            for topic in seq:
+                if topic not in self.conflated_topics:
+                    seq[topic] = max(seq[topic], covered)
+        return seq
+
+    async def connect(
+            self,
+            websocket: WebSocket,
+            min_interval: float = 0.0,
+            protocol: str = PROTOCOL_JSON,
+            encoding: str = ENCODING_JSON,
+            stream: Optional[str] = None,
+            last_seq: Optional[Dict[str, int]] = None
+    ):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        websocket.state.last_seen = time.monotonic()  # 마지막 수신 시각 (heartbeat 판정용)
+
+        # 클라이언트별 병합(conflation) 전송 상태
+        websocket.state.min_interval = min_interval  # 최소 전송 간격 (초)
+        websocket.state.last_sent = {}  # topic -> 마지막 전송 시각
+        websocket.state.pending = {}  # topic -> {key: 아직 전송하지 않은 최신 메시지}
+
+        # compact 프로토콜 협상 (기본은 기존 JSON 메시지)
+        websocket.state.encoder = None
+        if protocol == PROTOCOL_COMPACT:
+            websocket.state.encoder = CompactEncoder(encoding)
+            await self._send_frame(websocket, websocket.state.encoder.hello())
+
+        # 현재 스트림 정보 (클라이언트는 재연결 시 stream, last_seq를 전달)
+        await self._send_message(websocket, {
+            "type": "stream_info",
+            "stream": self.stream_id,
+            "seq": self._stream_seq(),
+            "timestamp": datetime.now().isoformat()
+        }, {})
+
+        if last_seq:
+            await self._resume(websocket, stream, last_seq)
+
+        # 재전송과 등록 사이에 await가 없으므로 누락/중복 없이 실시간 전송으로 이어짐
+        self.active_connections.add(websocket)
+
+    async def _resume(self, websocket: WebSocket, stream: Optional[str], last_seq: Dict[str, int]):
+        """놓친 메시지 재전송 (재전송 버퍼보다 오래된 경우 전체 재조회 요청)"""
+        encoded: Dict[int, str] = {}
+
+        for topic, last in last_seq.items():
+            if topic in self.conflated_topics:
+                await self._resume_conflated(websocket, topic, stream, last, encoded)
+                continue
+
+            buffer = self.replay_buffers.get(topic)
+            current = self.sequences.get(topic, 0)
+            floor = self._resume_floor(topic)
+
+            if stream != self.stream_id:
+                reason = "stream_changed"
+            elif floor is None or last < floor:
+                reason = "gap_too_old"
+            elif last >= current:
+                continue
+            else:
+                reason = None
+
+            if reason:
+                await self._send_message(websocket, {
+                    "type": "resync_required",
+                    "topic": topic,
+                    "reason": reason,
+                    "last_seq": last,
+                    "timestamp": datetime.now().isoformat()
+                }, encoded)
+                continue
+
+            # 전송 중 새로 발행된 메시지까지 따라잡을 때까지 반복
+            sent = last
+            while True:
+                missed = [message for message in buffer if message["seq"] > sent]
+                if not missed:
+                    break
+                for message in missed:
+                    await self._send_message(websocket, message, encoded)
+                sent = missed[-1]["seq"]
+
+    async def _resume_conflated(
+            self, websocket: WebSocket, topic: str, stream: Optional[str], last: int, encoded: Dict[int, str]
+    ):
+        """최신값 topic은 key별 마지막 메시지만 재전송
+
+        번호는 워커별로 부여되므로 다른 스트림(또는 공유 스트림)에서 온 번호는 비교하지 않고 전부 보낸다.
+        """
+        sent = last if (stream == self.stream_id and not self.shared) else 0
+        while True:
+            latest = self.conflated_latest.get(topic, {})
+            missed = [message for message in latest.values() if message["seq"] > sent]
+            if not missed:
+                break
+            for message in missed:
+                await self._send_message(websocket, message, encoded)
+            sent = max(message["seq"] for message in missed)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        # 클라이언트별 보류 메시지/델타 상태 해제
+        websocket.state.pending = {}
+        websocket.state.encoder = None
+
+    def touch(self, websocket: WebSocket):
+        """클라이언트로부터 프레임 수신 시 호출 (ping/pong 포함)"""
+        websocket.state.last_seen = time.monotonic()
+
+    def start_heartbeat(self):
+        """heartbeat 및 끊어진 연결 정리 태스크 시작"""
+        if self.reaper_task and not self.reaper_task.done():
+            return
+        self.reaper_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop_heartbeat(self):
+        if self.reaper_task and not self.reaper_task.done():
+            self.reaper_task.cancel()
+            try:
+                await self.reaper_task
+            except asyncio.CancelledError:
+                pass
+        self.reaper_task = None
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._heartbeat()
+            except Exception as e:
+                logger.error(f"WebSocket heartbeat 실패: {e}")
+
+    async def _heartbeat(self):
+        """응답 기한이 지난 연결은 정리하고, 유휴 연결에는 ping 전송"""
+        now = time.monotonic()
+        encoded: Dict[int, str] = {}
+        ping = {"type": "ping", "timestamp": datetime.now().isoformat()}
+
+        for connection in list(self.active_connections):
+            idle = now - connection.state.last_seen
+
+            if idle > self.heartbeat_timeout:
+                await self._reap(connection)
+                continue
+
+            if idle >= self.heartbeat_interval:
+                try:
+                    await asyncio.wait_for(
+                        self._send_message(connection, ping, encoded), self.send_timeout
+                    )
+                except Exception:
+                    await self._reap(connection)
+
+    async def _reap(self, websocket: WebSocket):
+        """응답 없는 연결 종료 및 자원 해제"""
+        if websocket not in self.active_connections:
+            return
+        self.disconnect(websocket)
+        self.reaped_count += 1
+        try:
+            await asyncio.wait_for(websocket.close(code=1001), self.send_timeout)
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict:
+        """연결 상태 게이지"""
+        return {
+            'live_connections': len(self.active_connections),
+            'reaped_connections': self.reaped_count,
+            'heartbeat_interval': self.heartbeat_interval,
+            'heartbeat_timeout': self.heartbeat_timeout
+        }
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: dict):
-        """모든 연결된 클라이언트에게 메시지 브로드캐스트"""
+    async def _send_frame(self, websocket: WebSocket, frame):
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+    async def _send_message(self, websocket: WebSocket, message: dict, encoded: Dict[int, str]):
+        """클라이언트 프로토콜에 맞춰 메시지 전송 (JSON 클라이언트는 인코딩 결과 공유)"""
+        encoder = websocket.state.encoder
+        if encoder is None:
+            message_str = encoded.get(id(message))
+            if message_str is None:
+                message_str = json.dumps(message, ensure_ascii=False, default=str)
+                encoded[id(message)] = message_str
+            await websocket.send_text(message_str)
+            return
+
+        frame = encoder.encode(message)
+        if frame is not None:  # 변경된 필드가 없으면 전송 생략
+            await self._send_frame(websocket, frame)
+
+    async def broadcast(self, message: dict, seq: Optional[int] = None):
+        """모든 연결된 클라이언트에게 메시지 브로드캐스트
+
+        seq는 이벤트 버스 발행 번호이며, 공유 스트림에서 번호 없이 전달된 메시지(버스 장애 시 로컬 전달)는
+        다른 워커와 번호가 어긋나므로 재개 대상에서 제외하고 번호 없이 보낸다.
+        """
+        if seq is not None or not self.shared:
+            message = self._stamp(message, seq)
         if self.active_connections:
-            message_str = json.dumps(message, ensure_ascii=False, default=str)
+            encoded: Dict[int, str] = {}
             disconnected = []
             
-            for connection in self.active_connections:
+            for connection in list(self.active_connections):
                 try:
-                    await connection.send_text(message_str)
+                    await self._send_message(connection, message, encoded)
                 except Exception:
                     disconnected.append(connection)
             
             # 연결이 끊어진 웹소켓 제거
             for connection in disconnected:
-                if connection in self.active_connections:
-                    self.active_connections.remove(connection)
+                self.disconnect(connection)
+
+    def has_pending(self, topic: str) -> bool:
+        """최소 전송 간격 때문에 아직 보내지 못한 메시지가 있는 연결이 있는지"""
+        return any(connection.state.pending.get(topic) for connection in self.active_connections)
+
+    async def broadcast_conflated(self, topic: str, updates: Dict[Any, dict]):
+        """병합된 최신 메시지 전송
+
+        updates는 key(지점 등)별 최신 메시지이며, 클라이언트의 최소 전송 간격이
+        지나지 않았으면 최신값만 보관했다가 다음 tick에 전송한다.
+        """
+        self.conflated_topics.add(topic)
+        updates = {key: self._stamp(message) for key, message in updates.items()}
+        self.conflated_latest.setdefault(topic, {}).update(updates)
+
+        if not self.active_connections:
+            return
+
+        now = time.monotonic()
+        encoded: Dict[int, str] = {}  # 같은 메시지는 tick당 한 번만 JSON 인코딩
+        disconnected = []
+
+        for connection in list(self.active_connections):
+            state = connection.state
+            pending = state.pending.setdefault(topic, {})
+            pending.update(updates)
+
+            if not pending or now - state.last_sent.get(topic, 0.0) < state.min_interval:
+                continue
+
+            try:
+                for message in pending.values():
+                    await self._send_message(connection, message, encoded)
+                pending.clear()
+                state.last_sent[topic] = now
+            except Exception:
+                disconnected.append(connection)
+
+        for connection in disconnected:
+            self.disconnect(connection)
 
 manager = ConnectionManager()
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(
+        websocket: WebSocket,
+        kpi_interval: float = Query(0.0, ge=0, le=60, description="클라이언트별 KPI 최소 수신 간격 (초)"),
+        protocol: str = Query(PROTOCOL_JSON, description="메시지 프로토콜: json, compact"),
+        encoding: str = Query(ENCODING_JSON, description="compact 프로토콜 인코딩: json, msgpack"),
+        stream: Optional[str] = Query(None, description="재연결 시 이전 stream_info의 stream"),
+        last_seq: Optional[str] = Query(None, description="재연결 시 topic별 마지막 수신 번호 (topic:seq,...)")
+):
+    await manager.connect(
+        websocket,
+        min_interval=kpi_interval,
+        protocol=protocol,
+        encoding=encoding,
+        stream=stream,
+        last_seq=parse_last_seq(last_seq)
+    )
     try:
         while True:
             # 클라이언트로부터 메시지 수신 (keep-alive 등)
             data = await websocket.receive_text()
+            manager.touch(websocket)
             
-            # ping 메시지에 대한 pong 응답
+            # ping 메시지에 대한 pong 응답 (서버 ping에 대한 클라이언트 "pong"은 수신 시각만 갱신)
             if data == "ping":
                 await websocket.send_text("pong")
                 
-    except WebSocketDisconnect:
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: heartbeat에서 이미 종료한 연결
+        pass
+    finally:
         manager.disconnect(websocket)
 
-async def broadcast_alert_update(alert_type: str, data: dict):
+async def broadcast_alert_update(alert_type: str, data: dict, seq: Optional[int] = None):
     """알람 업데이트를 모든 클라이언트에 브로드캐스트"""
     message = {
         "type": "alert_update",
@@ -62,7 +391,11 @@ async def broadcast_alert_update(alert_type: str, data: dict):
         "data": data,
         "timestamp": datetime.now().isoformat()
     }
-    await manager.broadcast(message)
+    await manager.broadcast(message, seq)
+
+async def relay_alert_event(payload: dict):
+    """이벤트 버스로 수신한 알람 이벤트를 이 워커의 클라이언트에 브로드캐스트"""
+    await broadcast_alert_update(payload["alert_type"], payload["data"], payload.get("bus_seq"))
 
 async def broadcast_system_status(status_data: dict):
     """시스템 상태 업데이트를 모든 클라이언트에 브로드캐스트"""
@@ -4,6 +4,9 @@ import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.database import get_db_pool
+from app.services.event_bus import event_bus, TOPIC_INTERVAL_SAVED
+from app.services.data_versions import data_versions, RESOURCE_TIMESERIES
+from app.services.daily_stats import refresh_daily_stats
 
 logger = logging.getLogger(__name__)
 
@@ -135,6 +138,20 @@ class AIDataBuffer:
             except Exception as e:
                 logger.error(f"DB 저장 실패: {e}")
                 raise
+
+        # 저장한 구간이 속한 날의 일별 통계 갱신 (실패해도 구간 저장은 유지)
+        try:
+            await refresh_daily_stats(self.flow_uid, flow_time.date(), self.interval_minutes)
+        except Exception as e:
+            logger.error(f"일별 통계 갱신 실패: {e}")
+
+        # 시계열 버전 갱신 (이 워커는 즉시, 다른 워커는 이벤트 수신 시)
+        version = data_versions.bump(RESOURCE_TIMESERIES, self.flow_uid)
+        await event_bus.publish(TOPIC_INTERVAL_SAVED, {
+            "flow_uid": self.flow_uid,
+            "flow_time": flow_time.isoformat(),
+            "version": version
+        })
     
     def get_latest_data_for_kpi(self) -> Optional[Dict]:
         """KPI 카드용 최신 데이터 반환"""
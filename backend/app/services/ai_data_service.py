@@ -5,6 +5,9 @@ import json
 from typing import Dict, Optional
 from datetime import datetime
 from app.services.ai_data_buffer import ai_data_buffer
+from app.services.realtime_publisher import realtime_publisher
+from app.services.event_bus import event_bus, TOPIC_REALTIME_KPI
+from app.services.data_versions import data_versions
 from app.routers.websocket import manager
 
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +27,9 @@ class AIDataService:
             return
         
         self.is_running = True
+
+        # 실시간 KPI 병합 발행기 시작
+        realtime_publisher.start()
         
         # 실제 AI 서버 연결 시도
         try:
@@ -53,6 +59,9 @@ class AIDataService:
                 await self.simulation_task
             except asyncio.CancelledError:
                 pass
+
+        # 남은 실시간 KPI 전송 후 발행기 중지
+        await realtime_publisher.stop()
         
         logger.info("AI 데이터 서비스 중지")
     
@@ -95,6 +104,7 @@ class AIDataService:
             message = {
                 'type': 'realtime_kpi_update',
                 'data': {
+                    'flow_uid': ai_data_buffer.flow_uid,
                     'water_level': water_level_cm,
                     'flow_velocity': kpi_data['flow_rate'] / 10,  # m/s
                     'discharge': kpi_data['flow_flux'],  # m³/s
@@ -104,8 +114,8 @@ class AIDataService:
                 'timestamp': datetime.now().isoformat()
             }
             
-            # 모든 연결된 클라이언트에 브로드캐스트
-            await manager.broadcast(message)
+            # 모든 워커로 발행 (지점별 최신값만 병합 주기마다 발행) → 각 워커가 tick 주기로 브로드캐스트
+            await event_bus.publish_latest(TOPIC_REALTIME_KPI, ai_data_buffer.flow_uid, message)
             
         except Exception as e:
             logger.error(f"실시간 데이터 브로드캐스트 실패: {e}")
@@ -290,6 +300,10 @@ class AIDataService:
             'is_running': self.is_running,
             'buffer_status': buffer_status,
             'connected_websockets': len(manager.active_connections) if manager else 0,
+            'websocket': manager.get_stats(),
+            'realtime_publisher': realtime_publisher.get_stats(),
+            'event_bus': event_bus.get_stats(),
+            'data_versions': data_versions.get_stats(),
             'last_update': datetime.now().isoformat()
         }
     
@@ -0,0 +1,321 @@
+# app/services/audit_writer.py
+import asyncio
+import glob
+import ipaddress
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import asyncpg
+from app.database import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = [
+    "event_type", "user_id", "ip_address", "user_agent",
+    "details", "level", "resource", "created_at"
+]
+
+# audit_logs의 VARCHAR 컬럼 길이 (마이그레이션 v1) - 넘는 값은 잘라서 기록
+COLUMN_WIDTHS = {"event_type": 100, "user_id": 100, "level": 20, "resource": 200}
+
+# 행 자체가 잘못되어 다시 시도해도 기록할 수 없는 오류 (배치 대신 한 행씩 기록하여 해당 행만 격리)
+ROW_ERRORS = (asyncpg.exceptions.DataError, asyncpg.exceptions.IntegrityConstraintViolationError)
+
+INSERT_SQL = (
+    f"INSERT INTO audit_logs ({', '.join(AUDIT_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(AUDIT_COLUMNS) + 1))})"
+)
+
+DEFAULT_SPILL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "audit_spill.jsonl")
+
+
+def _normalize_ip(ip_address: Optional[str]) -> Optional[str]:
+    """INET 컬럼에 넣을 수 없는 값은 None (배치 전체가 실패하지 않도록)"""
+    if not ip_address:
+        return None
+    try:
+        return str(ipaddress.ip_address(ip_address))
+    except ValueError:
+        return None
+
+def _fit(value: Optional[str], column: str) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value)
+    width = COLUMN_WIDTHS[column]
+    return value if len(value) <= width else value[:width]
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except (ProcessLookupError, OverflowError, ValueError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AuditWriter:
+    """감사 로그 비동기 배치 기록기
+
+    호출자는 enqueue로 메모리 버퍼에 넣기만 하고 DB를 기다리지 않는다.
+    백그라운드 작업이 AUDIT_BATCH_SIZE건이 모이거나 AUDIT_FLUSH_INTERVAL초가 지나면
+    copy_records_to_table로 한 번에 기록한다. DB에 기록하지 못한 로그는 로컬 파일(AUDIT_SPILL_PATH)에
+    남겨 두었다가 DB가 복구되면 먼저 다시 기록한다.
+    버퍼가 AUDIT_MAX_BUFFER건을 넘으면 넘친 로그는 flush 작업이 스레드에서 파일로 옮긴다.
+    배치가 데이터 오류로 실패하면 한 행씩 다시 기록하고, 기록할 수 없는 행만 격리 파일(.rejected)로 옮긴다.
+    """
+
+    def __init__(self):
+        self.batch_size = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+        self.flush_interval = float(os.getenv("AUDIT_FLUSH_INTERVAL", "2"))
+        self.max_buffer = int(os.getenv("AUDIT_MAX_BUFFER", "10000"))
+        self.spill_path = os.getenv("AUDIT_SPILL_PATH", DEFAULT_SPILL_PATH)
+        self.reject_path = f"{self.spill_path}.rejected"
+        self.flush_timeout = float(os.getenv("AUDIT_FLUSH_TIMEOUT", "30"))
+
+        self.buffer: List[Tuple] = []
+        # 버퍼가 넘쳐 파일로 옮길 로그 (flush 작업이 처리)
+        self.overflow: List[Tuple] = []
+        # 처리 중인 보관 파일 (이전 실행이 남긴 파일 포함)
+        self.pending_replays: List[str] = []
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.enqueued = 0
+        self.written = 0
+        self.spilled = 0
+        self.skipped_lines = 0
+        self.rejected = 0
+        self.flush_count = 0
+        self.last_error: Optional[str] = None
+
+    def enqueue(
+        self,
+        event_type: str,
+        user_id: Optional[str],
+        ip_address: Optional[str],
+        user_agent: Optional[str],
+        details: Dict,
+        level: str,
+        resource: Optional[str]
+    ):
+        """감사 로그 1건을 버퍼에 추가 (DB 대기 없음)"""
+        self.buffer.append((
+            _fit(event_type, "event_type"), _fit(user_id, "user_id"), _normalize_ip(ip_address), user_agent,
+            json.dumps(details, ensure_ascii=False, default=str),
+            _fit(level, "level"), _fit(resource, "resource"), datetime.now()
+        ))
+        self.enqueued += 1
+
+        if len(self.buffer) >= self.max_buffer:
+            # DB가 오래 응답하지 않아 버퍼가 가득 차면 파일로 넘길 목록으로 옮긴다 (파일 쓰기는 flush 작업에서)
+            self.overflow.extend(self.buffer)
+            self.buffer = []
+            self.wakeup.set()
+        elif len(self.buffer) >= self.batch_size:
+            self.wakeup.set()
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """종료 시 남은 로그를 모두 기록 (실패하면 파일로 보관)"""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        try:
+            self.pending_replays += await asyncio.to_thread(self._claim_orphans)
+        except Exception as e:
+            logger.error(f"남은 감사 로그 보관 파일 확인 실패: {e}")
+
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
+
+    async def _copy(self, records: List[Tuple]):
+        """배치 기록 (데이터 오류면 한 행씩 기록하여 잘못된 행만 격리, 연결 오류는 그대로 전달)"""
+        db_pool = get_db_pool()
+        async with db_pool.acquire(timeout=self.flush_timeout) as conn:
+            try:
+                await conn.copy_records_to_table(
+                    "audit_logs", records=records, columns=AUDIT_COLUMNS, timeout=self.flush_timeout
+                )
+                return
+            except ROW_ERRORS as e:
+                logger.warning(f"감사 로그 배치 기록 실패, 한 행씩 다시 기록 ({len(records)}건): {e}")
+
+            rejected = []
+            for record in records:
+                try:
+                    await conn.execute(INSERT_SQL, *record, timeout=self.flush_timeout)
+                except ROW_ERRORS as e:
+                    rejected.append((record, str(e)))
+        if rejected:
+            logger.error(f"기록할 수 없는 감사 로그 {len(rejected)}건 격리: {self.reject_path}")
+            await asyncio.to_thread(self._reject, rejected)
+
+    async def flush(self):
+        """버퍼와 보관 파일의 로그를 DB에 기록"""
+        overflow, self.overflow = self.overflow, []
+        if overflow:
+            logger.warning(f"감사 로그 버퍼 초과, 파일로 보관 ({len(overflow)}건)")
+            await asyncio.to_thread(self._spill, overflow)
+
+        records, self.buffer = self.buffer, []
+
+        try:
+            await self._replay_spill()
+            if records:
+                await self._copy(records)
+                self.written += len(records)
+            self.flush_count += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            if records:
+                logger.error(f"감사 로그 기록 실패, 파일로 보관 ({len(records)}건): {e}")
+                await asyncio.to_thread(self._spill, records)
+
+    # ---------------- 로컬 보관 파일 ----------------
+
+    def _spill(self, records: List[Tuple]):
+        os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for record in records:
+                row = list(record)
+                row[-1] = row[-1].isoformat()
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.spilled += len(records)
+
+    def _reject(self, rejected: List[Tuple[Tuple, str]]):
+        """DB에 넣을 수 없는 행을 격리 파일로 (다시 재생하지 않음)"""
+        os.makedirs(os.path.dirname(self.reject_path) or ".", exist_ok=True)
+        with open(self.reject_path, "a", encoding="utf-8") as f:
+            for record, error in rejected:
+                row = list(record)
+                row[-1] = row[-1].isoformat()
+                f.write(json.dumps({"row": row, "error": error}, ensure_ascii=False) + "\n")
+        self.rejected += len(rejected)
+
+    def _replay_path(self) -> str:
+        # 워커마다 다른 이름 (pid + 임의 값) - 같은 시각에 옮겨도 충돌하지 않도록
+        return f"{self.spill_path}.{os.getpid()}.{uuid.uuid4().hex}.replay"
+
+    def _claim_orphans(self) -> List[str]:
+        """이전 실행이 처리하다 남긴 보관 파일 회수 (종료된 프로세스의 파일만)"""
+        claimed = []
+        for path in glob.glob(f"{glob.escape(self.spill_path)}.*.replay"):
+            parts = path[len(self.spill_path) + 1:].split(".")
+            if len(parts) == 3 and parts[0].isdigit():
+                pid = int(parts[0])
+                if pid != os.getpid() and _pid_alive(pid):
+                    continue
+            replay_path = self._replay_path()
+            try:
+                os.replace(path, replay_path)
+            except FileNotFoundError:
+                # 다른 워커가 먼저 회수
+                continue
+            claimed.append(replay_path)
+        if claimed:
+            logger.info(f"남은 감사 로그 보관 파일 {len(claimed)}개 회수")
+        return claimed
+
+    def _take_spill(self) -> List[str]:
+        """보관 파일을 처리 중 파일로 옮기기 (읽는 동안 추가되는 로그와 섞이지 않도록)"""
+        if not os.path.exists(self.spill_path):
+            return []
+        replay_path = self._replay_path()
+        try:
+            os.replace(self.spill_path, replay_path)
+        except FileNotFoundError:
+            return []
+        return [replay_path]
+
+    def _read_spill(self, replay_path: str) -> List[Tuple]:
+        """처리 중 파일 읽기 (잘리거나 깨진 줄은 건너뜀)"""
+        records = []
+        with open(replay_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    row[-1] = datetime.fromisoformat(row[-1])
+                except (ValueError, TypeError, IndexError, KeyError) as e:
+                    self.skipped_lines += 1
+                    logger.warning(f"감사 로그 보관 파일의 손상된 줄 건너뜀 ({replay_path}:{line_no}): {e}")
+                    continue
+                if len(row) != len(AUDIT_COLUMNS):
+                    self.skipped_lines += 1
+                    logger.warning(f"감사 로그 보관 파일의 손상된 줄 건너뜀 ({replay_path}:{line_no}): 컬럼 수 불일치")
+                    continue
+                records.append(tuple(row))
+        return records
+
+    async def _replay_spill(self):
+        self.pending_replays += await asyncio.to_thread(self._take_spill)
+        while self.pending_replays:
+            await self._replay_file(self.pending_replays[0])
+            self.pending_replays.pop(0)
+
+    async def _replay_file(self, replay_path: str):
+        """처리 중 파일 재생 - 모든 행을 기록하거나 보관 파일로 되돌린 뒤에만 파일 삭제"""
+        records = await asyncio.to_thread(self._read_spill, replay_path)
+        done = 0
+        try:
+            while done < len(records):
+                batch = records[done:done + self.batch_size]
+                await self._copy(batch)
+                done += len(batch)
+                self.written += len(batch)
+        except Exception:
+            # 기록하지 못한 나머지는 다시 보관 파일로 (다음 flush에서 재시도)
+            try:
+                await asyncio.to_thread(self._spill, records[done:])
+            except Exception as e:
+                # 되돌리지 못하면 처리 중 파일을 남겨 두고 다음 flush에서 다시 재생 (일부 중복 가능, 유실 없음)
+                logger.error(f"감사 로그 보관 파일 되돌리기 실패, {replay_path} 유지: {e}")
+                raise
+            self.spilled -= len(records) - done
+            self.pending_replays.remove(replay_path)
+            os.remove(replay_path)
+            raise
+        os.remove(replay_path)
+        if records:
+            logger.info(f"보관된 감사 로그 {len(records)}건 기록 완료")
+
+    def get_stats(self) -> Dict:
+        return {
+            'running': self.task is not None and not self.task.done(),
+            'buffered': len(self.buffer),
+            'overflow': len(self.overflow),
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'spilled': self.spilled,
+            'skipped_lines': self.skipped_lines,
+            'rejected': self.rejected,
+            'flushes': self.flush_count,
+            'last_error': self.last_error
+        }
+
+# 싱글톤 인스턴스
+audit_writer = AuditWriter()
@@ -1,61 +1,73 @@
 from fastapi import HTTPException, Request
 from datetime import timedelta
 from app.models.auth import LoginRequest, LoginResponse, CreateUserRequest, CreateUserResponse
-from app.utils.auth_utils import verify_password, create_access_token, hash_password
+from app.utils.auth_utils import verify_password_async, create_access_token, hash_password_async
+from app.utils.rate_limiter import login_throttle
 from app.utils.audit_logger import AuditLogger
 from app.database import get_db_pool
 from app.config import settings
+from app.services.user_cache import invalidate_user
 
 
 class AuthService:
     async def authenticate_user(self, login_data: LoginRequest, client_ip: str) -> LoginResponse:
         """사용자 인증 처리"""
         
-        db_pool = get_db_pool()
+        # 잠긴 계정/IP는 DB 조회와 비밀번호 검증 없이 거절 (통과하면 결과가 기록될 때까지 시도 1회 예약)
+        login_throttle.check(login_data.username, client_ip)
 
-        async with db_pool.acquire() as conn:
-            # 사용자 정보 조회
-            user_row = await conn.fetchrow(
-                "SELECT user_uid, user_id, user_pwd, user_name, user_level FROM users WHERE user_id = $1",
-                login_data.username
-            )
+        try:
+            db_pool = get_db_pool()
+
+            async with db_pool.acquire() as conn:
+                # 사용자 정보 조회
+                user_row = await conn.fetchrow(
+                    "SELECT user_uid, user_id, user_pwd, user_name, user_level FROM users WHERE user_id = $1",
+                    login_data.username
+                )
+
+            # 인증 실패 처리 (비밀번호 검증은 DB 연결 반납 후 bcrypt 스레드 풀에서 수행)
+            if not user_row or not await verify_password_async(login_data.password, user_row['user_pwd']):
+                await login_throttle.record_failure(login_data.username, client_ip)
 
-            # 인증 실패 처리
-            if not user_row or not verify_password(login_data.password, user_row['user_pwd']):
                 # 감사 로그 기록 (LoginLogger 제거, AuditLogger만 사용)
                 await AuditLogger.log_login_failure(
                     login_data.username, client_ip,
                     "잘못된 사용자명 또는 비밀번호"
                 )
-                
+            
                 raise HTTPException(
                     status_code=401, 
                     detail="사용자명 또는 비밀번호가 올바르지 않습니다."
                 )
-            
+        
+            await login_throttle.record_success(login_data.username)
+
             # 감사 로그 기록 (LoginLogger 제거, AuditLogger만 사용)
             await AuditLogger.log_login_success(login_data.username, client_ip)
-
-            # JWT 토큰 생성
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-            if login_data.rememberMe:
-                access_token_expires = timedelta(days=30)
-
-            access_token = create_access_token(
-                data={"sub": user_row['user_id'], "user_uid": user_row['user_uid']},
-                expires_delta=access_token_expires
-            )
-
-            return LoginResponse(
-                access_token=access_token,
-                token_type="bearer",
-                user_info={
-                    "user_uid": user_row['user_uid'],
-                    "user_id": user_row['user_id'],
-                    "user_name": user_row['user_name'],
-                    "user_level": user_row['user_level']
-                }
-            )
+        finally:
+            login_throttle.release(login_data.username, client_ip)
+
+        # JWT 토큰 생성
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        if login_data.rememberMe:
+            access_token_expires = timedelta(days=30)
+
+        access_token = create_access_token(
+            data={"sub": user_row['user_id'], "user_uid": user_row['user_uid']},
+            expires_delta=access_token_expires
+        )
+
+        return LoginResponse(
+            access_token=access_token,
+            token_type="bearer",
+            user_info={
+                "user_uid": user_row['user_uid'],
+                "user_id": user_row['user_id'],
+                "user_name": user_row['user_name'],
+                "user_level": user_row['user_level']
+            }
+        )
 
     async def create_user(self, user_data: CreateUserRequest, current_user_level: int, current_user_id: str) -> CreateUserResponse:
         """새 사용자 생성 (관리자만 가능)"""
@@ -83,17 +95,18 @@ class AuthService:
                 user_data.user_id
             )
             
-            if existing_user:
-                raise HTTPException(
-                    status_code=400,
-                    detail="이미 존재하는 아이디입니다."
-                )
-            
-            # 비밀번호 해시화
-            hashed_password = hash_password(user_data.password)
-            
-            try:
-                # 새 사용자 추가
+        if existing_user:
+            raise HTTPException(
+                status_code=400,
+                detail="이미 존재하는 아이디입니다."
+            )
+        
+        # 비밀번호 해시화 (연결을 반납한 뒤 수행 - bcrypt 동안 풀 연결을 잡지 않도록)
+        hashed_password = await hash_password_async(user_data.password)
+        
+        try:
+            # 새 사용자 추가
+            async with db_pool.acquire() as conn:
                 user_uid = await conn.fetchval(
                     """INSERT INTO users (user_id, user_pwd, user_name, user_level, user_flow_uid, user_phone, user_createtime)
                        VALUES ($1, $2, $3, $4, $5, $6, NOW())
@@ -105,19 +118,19 @@ class AuthService:
                     user_data.user_flow_uid if user_data.user_level != 0 else None,  # 관리자는 NULL
                     user_data.phone if user_data.phone else None
                 )
-                
-                return CreateUserResponse(
-                    success=True,
-                    message="회원이 성공적으로 추가되었습니다.",
-                    user_uid=user_uid
-                )
-                
-            except Exception as e:
-                # 데이터베이스 오류 처리
-                raise HTTPException(
-                    status_code=500,
-                    detail="회원 추가 중 오류가 발생했습니다."
-                )
+            
+            return CreateUserResponse(
+                success=True,
+                message="회원이 성공적으로 추가되었습니다.",
+                user_uid=user_uid
+            )
+            
+        except Exception as e:
+            # 데이터베이스 오류 처리
+            raise HTTPException(
+                status_code=500,
+                detail="회원 추가 중 오류가 발생했습니다."
+            )
     
     async def change_password(self, user_uid: int, current_password: str, new_password: str):
         """비밀번호 변경"""
@@ -130,48 +143,56 @@ class AuthService:
                 user_uid
             )
 
-            if not user_row:
-                raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+        if not user_row:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-            # 기존 비밀번호 확인
-            if not verify_password(current_password, user_row['user_pwd']):
-                raise HTTPException(status_code=400, detail="기존 비밀번호가 일치하지 않습니다.")
+        # 기존 비밀번호 확인 (연결을 반납한 뒤 수행 - bcrypt 동안 풀 연결을 잡지 않도록)
+        if not await verify_password_async(current_password, user_row['user_pwd']):
+            raise HTTPException(status_code=400, detail="기존 비밀번호가 일치하지 않습니다.")
 
-            # 새 비밀번호 유효성 검사
-            password_validation = self._validate_password(new_password)
-            if not password_validation["valid"]:
-                raise HTTPException(status_code=400, detail=password_validation["message"])
+        # 새 비밀번호 유효성 검사
+        password_validation = self._validate_password(new_password)
+        if not password_validation["valid"]:
+            raise HTTPException(status_code=400, detail=password_validation["message"])
 
-            # 새 비밀번호 해시화
-            hashed_new_password = hash_password(new_password)
+        # 새 비밀번호 해시화
+        hashed_new_password = await hash_password_async(new_password)
 
-            try:
-                # 비밀번호 업데이트
-                await conn.execute(
-                    "UPDATE users SET user_pwd = $1 WHERE user_uid = $2",
-                    hashed_new_password, user_uid
+        try:
+            # 비밀번호 업데이트 (확인한 비밀번호가 그 사이 바뀌지 않은 경우에만)
+            async with db_pool.acquire() as conn:
+                status = await conn.execute(
+                    "UPDATE users SET user_pwd = $1 WHERE user_uid = $2 AND user_pwd = $3",
+                    hashed_new_password, user_uid, user_row['user_pwd']
                 )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail="비밀번호 변경 중 오류가 발생했습니다."
+            )
 
-                # 감사 로그 기록
-                try:
-                    await AuditLogger.log_password_change(
-                        user_id=user_row['user_id'],
-                        ip_address="127.0.0.1"
-                    )
-                except Exception:
-                    # 감사 로그 실패는 비밀번호 변경 성공에 영향을 주지 않음
-                    pass
-
-                return {
-                    "message": "비밀번호가 성공적으로 변경되었습니다.",
-                    "success": True
-                }
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail="비밀번호 변경 중 오류가 발생했습니다."
-                )
+        if status == "UPDATE 0":
+            raise HTTPException(
+                status_code=409,
+                detail="비밀번호가 다른 요청으로 변경되었습니다. 다시 시도해주세요."
+            )
+
+        await invalidate_user(user_uid)
+
+        # 감사 로그 기록
+        try:
+            await AuditLogger.log_password_change(
+                user_id=user_row['user_id'],
+                ip_address="127.0.0.1"
+            )
+        except Exception:
+            # 감사 로그 실패는 비밀번호 변경 성공에 영향을 주지 않음
+            pass
+
+        return {
+            "message": "비밀번호가 성공적으로 변경되었습니다.",
+            "success": True
+        }
     
     def _validate_password(self, password: str) -> dict:
         """비밀번호 보안 정책 검증"""
@@ -0,0 +1,110 @@
+# app/services/daily_stats.py
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from app.database import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+# flow_detail_info 1행이 대표하는 시간 (AIDataBuffer 저장 구간, 분)
+SAMPLE_MINUTES = int(os.getenv("FLOW_SAMPLE_MINUTES", "5"))
+
+# 지정한 조건의 측정값을 지점/일 단위로 집계하여 flow_daily_stats에 반영 (이미 있으면 갱신)
+# 주의/위험 수위는 관리자 알림 설정 기준 (없으면 10/15cm)
+UPSERT_QUERY = """
+WITH thresholds AS (
+    SELECT s.warning_level, s.danger_level
+    FROM settings s
+    JOIN users u ON u.user_uid = s.user_uid
+    WHERE u.user_level = 0
+    LIMIT 1
+)
+INSERT INTO flow_daily_stats (
+    flow_uid, stat_date, sample_count,
+    min_level, max_level, avg_level, p95_level,
+    peak_velocity, discharge_volume,
+    minutes_above_warning, minutes_above_danger, updated_at
+)
+SELECT
+    d.flow_uid,
+    d.flow_time::date,
+    COUNT(*),
+    MIN(d.flow_waterlevel),
+    MAX(d.flow_waterlevel),
+    AVG(d.flow_waterlevel),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY d.flow_waterlevel),
+    MAX(d.flow_rate) / 10,
+    SUM(d.flow_flux) * $1 * 60,
+    COUNT(*) FILTER (WHERE d.flow_waterlevel > COALESCE(t.warning_level, 10)) * $1,
+    COUNT(*) FILTER (WHERE d.flow_waterlevel > COALESCE(t.danger_level, 15)) * $1,
+    NOW()
+FROM flow_detail_info d
+LEFT JOIN thresholds t ON true
+WHERE d.flow_time >= $2 AND d.flow_time < $3 {flow_condition}
+GROUP BY d.flow_uid, d.flow_time::date
+ON CONFLICT (flow_uid, stat_date) DO UPDATE SET
+    sample_count = EXCLUDED.sample_count,
+    min_level = EXCLUDED.min_level,
+    max_level = EXCLUDED.max_level,
+    avg_level = EXCLUDED.avg_level,
+    p95_level = EXCLUDED.p95_level,
+    peak_velocity = EXCLUDED.peak_velocity,
+    discharge_volume = EXCLUDED.discharge_volume,
+    minutes_above_warning = EXCLUDED.minutes_above_warning,
+    minutes_above_danger = EXCLUDED.minutes_above_danger,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+async def _upsert_range(conn, start: datetime, end: datetime, flow_uid: Optional[int], sample_minutes: int) -> str:
+    if flow_uid is None:
+        return await conn.execute(UPSERT_QUERY.format(flow_condition=""), sample_minutes, start, end)
+    return await conn.execute(
+        UPSERT_QUERY.format(flow_condition="AND d.flow_uid = $4"), sample_minutes, start, end, flow_uid
+    )
+
+
+async def refresh_daily_stats(flow_uid: int, day: date, sample_minutes: int = SAMPLE_MINUTES):
+    """하루치 통계 재계산 (구간 저장 시 호출 - 해당 일의 최대 288행만 집계)"""
+    start = datetime.combine(day, datetime.min.time())
+    db_pool = get_db_pool()
+    async with db_pool.acquire() as conn:
+        await _upsert_range(conn, start, start + timedelta(days=1), flow_uid, sample_minutes)
+
+
+async def backfill_daily_stats(
+        flow_uid: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        sample_minutes: int = SAMPLE_MINUTES
+) -> Dict:
+    """과거 측정 이력으로 일별 통계 채우기 (월 단위로 나누어 집계)"""
+    db_pool = get_db_pool()
+    async with db_pool.acquire() as conn:
+        if start is None or end is None:
+            bounds = await conn.fetchrow(
+                "SELECT MIN(flow_time)::date AS first_day, MAX(flow_time)::date AS last_day FROM flow_detail_info"
+                + (" WHERE flow_uid = $1" if flow_uid is not None else ""),
+                *([flow_uid] if flow_uid is not None else [])
+            )
+            if bounds['first_day'] is None:
+                return {"days": 0, "start": None, "end": None}
+            start = start or bounds['first_day']
+            end = end or bounds['last_day']
+
+        chunk_start = start
+        while chunk_start <= end:
+            next_month = (chunk_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+            chunk_end = min(next_month, end + timedelta(days=1))
+            await _upsert_range(
+                conn,
+                datetime.combine(chunk_start, datetime.min.time()),
+                datetime.combine(chunk_end, datetime.min.time()),
+                flow_uid, sample_minutes
+            )
+            chunk_start = chunk_end
+
+    days = (end - start).days + 1
+    logger.info(f"일별 통계 백필 완료 - flow_uid: {flow_uid or '전체'}, {start} ~ {end}")
+    return {"days": days, "start": start.isoformat(), "end": end.isoformat()}
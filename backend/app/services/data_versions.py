@@ -0,0 +1,136 @@
+# app/services/data_versions.py
+import hashlib
+import logging
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+from app.services.event_bus import event_bus, PostgresEventBus
+
+logger = logging.getLogger(__name__)
+
+# 버전을 관리하는 리소스
+RESOURCE_TIMESERIES = "timeseries"
+RESOURCE_ALERTS = "alerts"
+RESOURCE_INFO = "info"
+RESOURCE_CAMERAS = "cameras"
+
+
+def new_version() -> int:
+    """새 버전 값 (epoch ms) - 이벤트에 실어 보내 모든 워커가 같은 값을 갖도록 한다"""
+    return int(time.time() * 1000)
+
+
+class DataVersions:
+    """조회 API 조건부 응답(ETag/Last-Modified)을 위한 리소스별 버전 관리
+
+    데이터가 바뀌는 지점(구간 저장, 알람 추가/삭제, 관리자 수정)에서 버전을 올리고,
+    이벤트 버스 구독으로 다른 워커에도 같은 버전이 반영된다.
+    버전을 알 수 없는 리소스는 프로세스 시작 시각을 버전으로 사용한다.
+
+    여러 워커(WEB_CONCURRENCY > 1)인데 이벤트 버스가 memory이면 다른 워커의 변경이 버전에 반영되지
+    않으므로, ETag에 ETAG_LOCAL_TTL초 단위 시간 구간을 넣어 304 응답이 그 시간 이상 이어지지 않게 한다.
+    """
+
+    def __init__(self):
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        self.shared = isinstance(event_bus, PostgresEventBus)
+        self.local_ttl: Optional[float] = None
+        if workers > 1 and not self.shared:
+            self.local_ttl = float(os.getenv("ETAG_LOCAL_TTL", "30"))
+            logger.warning(
+                f"워커 {workers}개에 EVENT_BUS_BACKEND=memory - 조건부 응답은 최대 {int(self.local_ttl)}초만 유지됩니다 "
+                f"(EVENT_BUS_BACKEND=postgres 권장)"
+            )
+
+        self.boot_version = new_version()
+        self._versions: Dict[tuple, int] = {}   # (resource, flow_uid) -> version
+        self._floors: Dict[str, int] = {}       # flow_uid를 모르는 변경 -> 리소스 전체 버전
+
+        # 통계
+        self.bump_count = 0
+        self.not_modified_count = 0
+
+    def get(self, resource: str, flow_uid: Optional[int]) -> int:
+        return max(
+            self._versions.get((resource, flow_uid), 0),
+            self._floors.get(resource, 0),
+            self.boot_version
+        )
+
+    def bump(self, resource: str, flow_uid: Optional[int] = None, version: Optional[int] = None) -> int:
+        """버전 갱신 (flow_uid가 없으면 해당 리소스 전체) - 같은 이벤트를 여러 번 받아도 결과는 같다"""
+        version = version or new_version()
+        if flow_uid is None:
+            self._floors[resource] = max(self._floors.get(resource, 0), version)
+        else:
+            key = (resource, flow_uid)
+            self._versions[key] = max(self._versions.get(key, 0), version)
+        self.bump_count += 1
+        return version
+
+    def etag(self, resource: str, flow_uid: Optional[int], variant: str = "") -> str:
+        """리소스 버전과 요청 변형(쿼리 파라미터 등)으로 만든 약한 ETag"""
+        raw = f"{resource}:{flow_uid}:{self.get(resource, flow_uid)}:{variant}"
+        if self.local_ttl:
+            raw += f":{int(time.time() // self.local_ttl)}"
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+    def last_modified(self, resource: str, flow_uid: Optional[int]) -> str:
+        return formatdate(self.get(resource, flow_uid) / 1000, usegmt=True)
+
+    def is_not_modified(
+            self, headers, etag: str, resource: str, flow_uid: Optional[int], allow_since: bool = True
+    ) -> bool:
+        """If-None-Match(우선) 또는 If-Modified-Since 기준으로 304 응답 가능 여부 판단
+
+        allow_since=False이면 ETag로만 판단 (조회 구간이 시각에 따라 달라지는 요청용)
+        """
+        if_none_match = headers.get("if-none-match")
+        if self.local_ttl:
+            # 다른 워커의 변경 시각을 알 수 없으므로 If-Modified-Since는 사용하지 않음
+            allow_since = False
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            matched = "*" in tags or etag in tags or etag[2:] in tags
+        else:
+            if_modified_since = headers.get("if-modified-since")
+            if not if_modified_since or not allow_since:
+                return False
+            try:
+                since_ms = parsedate_to_datetime(if_modified_since).timestamp() * 1000
+            except (TypeError, ValueError):
+                return False
+            # HTTP 날짜는 초 단위이므로 버전도 초 단위로 비교
+            matched = self.get(resource, flow_uid) // 1000 * 1000 <= since_ms
+
+        if matched:
+            self.not_modified_count += 1
+        return matched
+
+    async def on_alert_changed(self, payload: dict):
+        """이벤트 버스 알람 이벤트 처리"""
+        self.bump(RESOURCE_ALERTS, payload.get("flow_uid"), payload.get("version"))
+
+    async def on_reference_changed(self, payload: dict):
+        """이벤트 버스 지점/카메라 변경 이벤트 처리"""
+        flow_uids = payload.get("flow_uids") or [None]
+        for flow_uid in flow_uids:
+            self.bump(RESOURCE_INFO, flow_uid, payload.get("version"))
+            self.bump(RESOURCE_CAMERAS, flow_uid, payload.get("version"))
+
+    async def on_interval_saved(self, payload: dict):
+        """이벤트 버스 구간 저장 이벤트 처리"""
+        self.bump(RESOURCE_TIMESERIES, payload.get("flow_uid"), payload.get("version"))
+
+    def get_stats(self) -> Dict:
+        return {
+            'shared': self.shared,
+            'local_ttl': self.local_ttl,
+            'tracked': len(self._versions),
+            'bumps': self.bump_count,
+            'not_modified': self.not_modified_count
+        }
+
+# 싱글톤 인스턴스
+data_versions = DataVersions()
@@ -0,0 +1,287 @@
+# app/services/event_bus.py
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Dict, List, Callable, Awaitable, Any, Optional
+import asyncpg
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 토픽
+TOPIC_REALTIME_KPI = "realtime_kpi"
+TOPIC_ALERT = "alert"
+TOPIC_REFERENCE_CHANGED = "reference_changed"
+TOPIC_INTERVAL_SAVED = "interval_saved"
+TOPIC_USER_CHANGED = "user_changed"
+TOPIC_LOGIN_THROTTLE = "login_throttle"
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class InProcessEventBus:
+    """프로세스 내부 이벤트 버스 (기본값, 단일 워커용)"""
+
+    # 발행 순서 번호(bus_seq)를 모든 워커가 공유하는지 여부
+    shared_sequence = False
+    # publish_latest를 버스에서 병합하는지 여부 (False면 즉시 전달)
+    conflates_latest = False
+
+    def __init__(self):
+        self.handlers: Dict[str, List[EventHandler]] = {}
+        self.published_count = 0
+        self.delivered_count = 0
+
+    def subscribe(self, topic: str, handler: EventHandler):
+        """토픽 구독 핸들러 등록"""
+        self.handlers.setdefault(topic, []).append(handler)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, topic: str, payload: Dict[str, Any]):
+        """이벤트 발행"""
+        self.published_count += 1
+        await self._dispatch(topic, payload)
+
+    async def publish_latest(self, topic: str, key: Any, payload: Dict[str, Any]):
+        """최신값만 의미 있는 이벤트 발행 (프로세스 내부에서는 즉시 전달 - 병합은 수신 측에서 수행)"""
+        await self.publish(topic, payload)
+
+    async def _dispatch(self, topic: str, payload: Dict[str, Any]):
+        """이 워커의 구독 핸들러에 이벤트 전달"""
+        for handler in self.handlers.get(topic, []):
+            try:
+                await handler(payload)
+                self.delivered_count += 1
+            except Exception as e:
+                logger.error(f"이벤트 처리 실패 ({topic}): {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            'backend': 'memory',
+            'published': self.published_count,
+            'delivered': self.delivered_count
+        }
+
+
+class PostgresEventBus(InProcessEventBus):
+    """Postgres LISTEN/NOTIFY 기반 워커 간 이벤트 버스
+
+    모든 워커가 같은 채널을 LISTEN 하고, 발행은 전용 연결에서 pg_notify로 수행한다 (요청용 풀을 쓰지 않음).
+    발행한 워커 자신도 NOTIFY를 수신하므로 로컬 전달은 수신 경로에서만 일어난다.
+    실시간 KPI처럼 최신값만 의미 있는 이벤트는 publish_latest로 key별 최신값만 남겨
+    EVENT_BUS_CONFLATE_INTERVAL초마다 한 번씩 발행한다.
+
+    NOTIFY마다 DB 시퀀스(event_bus_seq) 번호를 붙여 보내고, 수신한 payload에 bus_seq로 넣어 전달한다.
+    모든 워커가 같은 이벤트에 같은 번호를 보므로 WebSocket 재개 번호를 워커 간에 공유할 수 있다.
+    """
+
+    shared_sequence = True
+    conflates_latest = True
+
+    # NOTIFY payload 최대 크기는 8000 bytes (시퀀스 번호 접두어 여유 포함)
+    MAX_PAYLOAD_BYTES = 7850
+
+    def __init__(self, channel: str = None, reconnect_interval: float = None):
+        super().__init__()
+        self.channel = channel or os.getenv("EVENT_BUS_CHANNEL", "flow_dashboard_events")
+        self.reconnect_interval = reconnect_interval or float(os.getenv("EVENT_BUS_RECONNECT_INTERVAL", "5"))
+        self.origin = uuid.uuid4().hex  # 워커 식별자 (디버깅용)
+        self.conflate_interval = float(
+            os.getenv("EVENT_BUS_CONFLATE_INTERVAL", os.getenv("WS_TICK_INTERVAL", "0.5"))
+        )
+        self.listen_conn: Optional[asyncpg.Connection] = None
+        # LISTEN을 시작한 시점의 시퀀스 값 - 이 연결로 그보다 큰 번호의 이벤트는 모두 수신
+        self.listen_since: Optional[int] = None
+        self.notify_conn: Optional[asyncpg.Connection] = None
+        self.notify_lock = asyncio.Lock()
+        self.watch_task: Optional[asyncio.Task] = None
+        self.fallback_count = 0
+
+        # 수신한 NOTIFY는 큐에 넣고 하나의 소비 태스크가 순서대로 처리
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.consume_task: Optional[asyncio.Task] = None
+
+        # (topic, key) -> 아직 발행하지 않은 최신 payload
+        self.pending_latest: Dict[tuple, Dict[str, Any]] = {}
+        self.conflate_task: Optional[asyncio.Task] = None
+        self.conflated_count = 0
+
+    async def start(self):
+        """수신 처리/연결 감시 태스크 실행 후 LISTEN 연결 시작 (실패하면 감시 태스크가 재시도)"""
+        if self.consume_task is None or self.consume_task.done():
+            self.consume_task = asyncio.create_task(self._consume())
+        if self.watch_task is None or self.watch_task.done():
+            self.watch_task = asyncio.create_task(self._watch_connection())
+        try:
+            await self._listen()
+        except Exception as e:
+            logger.error(f"이벤트 버스 LISTEN 실패, {self.reconnect_interval}초 후 재시도: {e}")
+
+    async def stop(self):
+        if self.conflate_task and not self.conflate_task.done():
+            self.conflate_task.cancel()
+            try:
+                await self.conflate_task
+            except asyncio.CancelledError:
+                pass
+        self.conflate_task = None
+        await self._flush_latest()
+
+        for task in (self.watch_task, self.consume_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.watch_task = None
+        self.consume_task = None
+
+        await self._close_notify_conn()
+
+        if self.listen_conn and not self.listen_conn.is_closed():
+            try:
+                await self.listen_conn.remove_listener(self.channel, self._on_notify)
+                await self.listen_conn.close()
+            except Exception as e:
+                logger.error(f"이벤트 버스 연결 종료 오류: {e}")
+        self.listen_conn = None
+
+    async def _listen(self):
+        conn = await asyncpg.connect(settings.DATABASE_URL)
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+            # LISTEN 이후에 읽으므로 이 값보다 큰 번호의 이벤트는 빠짐없이 수신된다
+            row = await conn.fetchrow("SELECT last_value, is_called FROM event_bus_seq")
+        except Exception:
+            await conn.close()
+            raise
+        self.listen_conn = conn
+        self.listen_since = row['last_value'] if row['is_called'] else 0
+        logger.info(f"이벤트 버스 LISTEN 시작: {self.channel} (seq {self.listen_since} 이후)")
+
+    def covered_since(self) -> Optional[int]:
+        """이 워커가 빠짐없이 수신한 이벤트 번호의 시작점 (LISTEN 연결이 없으면 None)"""
+        if self.listen_conn is None or self.listen_conn.is_closed():
+            return None
+        return self.listen_since
+
+    async def _watch_connection(self):
+        """LISTEN 연결이 끊기면 재연결"""
+        while True:
+            await asyncio.sleep(self.reconnect_interval)
+            if self.listen_conn is not None and not self.listen_conn.is_closed():
+                continue
+            # 끊긴 동안의 이벤트는 놓쳤으므로 재연결 시점부터 다시 계산
+            self.listen_since = None
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.error(f"이벤트 버스 재연결 실패: {e}")
+
+    async def publish(self, topic: str, payload: Dict[str, Any]):
+        """pg_notify로 모든 워커에 발행 (실패 시 이 워커에만 전달)"""
+        self.published_count += 1
+        data = json.dumps(
+            {'topic': topic, 'origin': self.origin, 'payload': payload},
+            ensure_ascii=False, default=str
+        )
+
+        if len(data.encode('utf-8')) > self.MAX_PAYLOAD_BYTES:
+            logger.warning(f"이벤트 크기 초과로 로컬에만 전달: {topic}")
+            self.fallback_count += 1
+            await self._dispatch(topic, payload)
+            return
+
+        try:
+            await self._notify(data)
+        except Exception as e:
+            logger.error(f"이벤트 발행 실패, 로컬에만 전달: {e}")
+            self.fallback_count += 1
+            await self._close_notify_conn()
+            await self._dispatch(topic, payload)
+
+    async def _notify(self, data: str):
+        """발행 전용 연결로 pg_notify (끊겨 있으면 다시 연결, 한 번에 하나씩 실행)"""
+        async with self.notify_lock:
+            if self.notify_conn is None or self.notify_conn.is_closed():
+                self.notify_conn = await asyncpg.connect(settings.DATABASE_URL)
+            await self.notify_conn.execute(
+                "SELECT pg_notify($1, nextval('event_bus_seq')::text || ':' || $2)", self.channel, data
+            )
+
+    async def _close_notify_conn(self):
+        conn, self.notify_conn = self.notify_conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception as e:
+                logger.error(f"이벤트 발행 연결 종료 오류: {e}")
+
+    async def publish_latest(self, topic: str, key: Any, payload: Dict[str, Any]):
+        """key별 최신값만 보관하고 병합 주기마다 발행 (샘플마다 NOTIFY 하지 않음)"""
+        if (topic, key) in self.pending_latest:
+            self.conflated_count += 1
+        self.pending_latest[(topic, key)] = payload
+        if self.conflate_task is None or self.conflate_task.done():
+            self.conflate_task = asyncio.create_task(self._conflate_loop())
+
+    async def _conflate_loop(self):
+        while True:
+            await asyncio.sleep(self.conflate_interval)
+            try:
+                await self._flush_latest()
+            except Exception as e:
+                logger.error(f"병합 이벤트 발행 실패: {e}")
+
+    async def _flush_latest(self):
+        pending, self.pending_latest = self.pending_latest, {}
+        for (topic, _key), payload in pending.items():
+            await self.publish(topic, payload)
+
+    def _on_notify(self, connection, pid, channel, data):
+        try:
+            seq, _, body = data.partition(":")
+            event = json.loads(body)
+            event['payload']['bus_seq'] = int(seq)
+        except Exception as e:
+            logger.error(f"이벤트 파싱 실패: {e}")
+            return
+        self.inbox.put_nowait(event)
+
+    async def _consume(self):
+        """수신한 이벤트를 도착 순서대로 이 워커의 핸들러에 전달"""
+        while True:
+            event = await self.inbox.get()
+            await self._dispatch(event['topic'], event['payload'])
+
+    def get_stats(self) -> Dict:
+        return {
+            'backend': 'postgres',
+            'channel': self.channel,
+            'listening': self.listen_conn is not None and not self.listen_conn.is_closed(),
+            'listen_since': self.covered_since(),
+            'inbox': self.inbox.qsize(),
+            'published': self.published_count,
+            'conflated': self.conflated_count,
+            'delivered': self.delivered_count,
+            'local_fallback': self.fallback_count
+        }
+
+
+def create_event_bus():
+    """EVENT_BUS_BACKEND 환경변수에 따라 이벤트 버스 생성 (memory | postgres)"""
+    backend = os.getenv("EVENT_BUS_BACKEND", "memory").lower()
+    if backend == "postgres":
+        return PostgresEventBus()
+    return InProcessEventBus()
+
+# 싱글톤 인스턴스
+event_bus = create_event_bus()
@@ -0,0 +1,185 @@
+# app/services/export_service.py
+import asyncio
+import csv
+import io
+import logging
+import os
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+import asyncpg
+from app.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치 시 CSV만 지원
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMAT_ARROW = "arrow"
+
+MEDIA_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv; charset=utf-8",
+    EXPORT_FORMAT_PARQUET: "application/vnd.apache.parquet",
+    EXPORT_FORMAT_ARROW: "application/vnd.apache.arrow.stream",
+}
+
+# 한 번에 커서에서 가져와 내보내는 행 수 (메모리 사용량 상한)
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+
+# 동시에 진행할 수 있는 내보내기 수 - 내보내기는 요청용 풀이 아닌 전용 연결을 사용하므로
+# 느린 클라이언트가 다운로드하는 동안에도 실시간/API 요청의 DB 연결에는 영향이 없다
+EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))
+export_slots = asyncio.Semaphore(EXPORT_MAX_CONCURRENT)
+
+COLUMNS = ["flow_uid", "flow_time", "flow_waterlevel_cm", "flow_velocity_mps", "flow_flux_m3ps"]
+
+
+def is_export_busy() -> bool:
+    """진행 중인 내보내기가 최대 개수에 도달했는지 여부"""
+    return export_slots.locked()
+
+
+def is_format_available(export_format: str) -> bool:
+    """내보내기 형식 사용 가능 여부 (parquet/arrow는 pyarrow 필요)"""
+    if export_format == EXPORT_FORMAT_CSV:
+        return True
+    return export_format in MEDIA_TYPES and pa is not None
+
+
+class _ChunkSink(io.RawIOBase):
+    """pyarrow writer가 쓴 바이트를 모아 두었다가 청크 단위로 꺼내는 파일 객체"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _iter_flow_rows(
+        flow_uid: Optional[int],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        chunk_rows: int
+) -> AsyncIterator[List[tuple]]:
+    """서버 측 커서로 flow_detail_info를 chunk_rows 단위로 조회"""
+    conditions = []
+    args = []
+    if flow_uid is not None:
+        args.append(flow_uid)
+        conditions.append(f"flow_uid = ${len(args)}")
+    if start is not None:
+        args.append(start)
+        conditions.append(f"flow_time >= ${len(args)}")
+    if end is not None:
+        args.append(end)
+        conditions.append(f"flow_time < ${len(args)}")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    query = f"""
+    SELECT
+        flow_uid,
+        flow_time,
+        flow_waterlevel::float8,
+        flow_rate::float8 / 10,
+        flow_flux::float8
+    FROM flow_detail_info
+    {where}
+    ORDER BY flow_uid, flow_time
+    """
+
+    async with export_slots:
+        # 다운로드 동안 연결과 트랜잭션이 유지되므로 요청용 풀 대신 전용 연결 사용
+        conn = await asyncpg.connect(settings.DATABASE_URL)
+        try:
+            # asyncpg 커서는 트랜잭션 안에서만 사용 가능
+            async with conn.transaction(readonly=True):
+                cursor = await conn.cursor(query, *args)
+                while True:
+                    records = await cursor.fetch(chunk_rows)
+                    if not records:
+                        break
+                    yield [tuple(record) for record in records]
+        finally:
+            await conn.close()
+
+
+async def stream_flow_history(
+        export_format: str,
+        flow_uid: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> AsyncIterator[bytes]:
+    """측정 이력을 청크 단위 바이트 스트림으로 내보내기 (전체 행 수와 무관하게 메모리 사용량 일정)"""
+    rows = _iter_flow_rows(flow_uid, start, end, chunk_rows)
+    total = 0
+
+    if export_format == EXPORT_FORMAT_CSV:
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+        async for chunk in rows:
+            buffer.seek(0)
+            buffer.truncate()
+            for flow_uid_value, flow_time, level, velocity, flux in chunk:
+                writer.writerow([flow_uid_value, flow_time.isoformat(), level, velocity, flux])
+            total += len(chunk)
+            yield buffer.getvalue().encode("utf-8")
+
+    else:
+        schema = pa.schema([
+            ("flow_uid", pa.int32()),
+            ("flow_time", pa.timestamp("us")),
+            ("flow_waterlevel_cm", pa.float64()),
+            ("flow_velocity_mps", pa.float64()),
+            ("flow_flux_m3ps", pa.float64()),
+        ])
+        sink = _ChunkSink()
+        if export_format == EXPORT_FORMAT_PARQUET:
+            writer = pq.ParquetWriter(sink, schema)
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        try:
+            async for chunk in rows:
+                columns = list(zip(*chunk))
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                )
+                if export_format == EXPORT_FORMAT_PARQUET:
+                    writer.write_table(pa.Table.from_batches([batch]))  # 청크마다 row group 하나
+                else:
+                    writer.write_batch(batch)
+                total += len(chunk)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    logger.info(f"측정 이력 내보내기 완료 - 형식: {export_format}, 행 수: {total}")
@@ -1,18 +1,130 @@
 # app/services/flow_service.py
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import base64
+import math
 import logging
+import numpy as np
 from app.database import get_db_pool
+from app.utils.downsampling import lttb_indices
+from app.services.reference_cache import reference_cache, flow_info_key, cameras_key
+from app.services.data_versions import data_versions, RESOURCE_ALERTS, RESOURCE_TIMESERIES
+from app.utils.single_flight import SingleFlight
 from app.services.ai_data_buffer import ai_data_buffer
 from app.services.ai_data_service import ai_data_service
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+# 동일 쿼리 동시 호출 병합 (FlowService는 요청마다 생성되므로 모듈 단위로 공유)
+query_single_flight = SingleFlight()
+
+# 버킷 간격 단위
+BUCKET_UNITS = {
+    "s": timedelta(seconds=1),
+    "m": timedelta(minutes=1),
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "w": timedelta(weeks=1),
+}
+
+# 자동 선택 시 사용하는 버킷 간격
+AUTO_BUCKETS = [
+    timedelta(minutes=5), timedelta(minutes=15), timedelta(minutes=30),
+    timedelta(hours=1), timedelta(hours=3), timedelta(hours=6), timedelta(hours=12),
+    timedelta(days=1), timedelta(weeks=1),
+]
+
+MAX_BUCKETS = 5000
+
+# 최신값 조회 시 먼저 확인하는 기간 (이 기간의 월 파티션만 조회)
+LATEST_LOOKBACK = timedelta(days=31)
+
+# 주요 조회 쿼리 - 시작 시 실행 계획 점검(migrations.check_query_plans)도 같은 SQL을 사용
+LATEST_FLOW_QUERY = """
+SELECT flow_rate, flow_flux, flow_waterlevel, flow_time
+FROM flow_detail_info
+WHERE flow_uid = $1 AND flow_time >= $2
+ORDER BY flow_time DESC
+LIMIT 1
+"""
+
+TIMESERIES_QUERY = """
+SELECT flow_rate, flow_flux, flow_waterlevel, flow_time
+FROM flow_detail_info
+WHERE flow_uid = $1 AND flow_time >= $2
+ORDER BY flow_time ASC
+"""
+
+RECENT_ALERTS_QUERY = """
+SELECT alert_uid, alert_date, alert_message, alert_type
+FROM alert_info
+WHERE flow_uid = $1
+ORDER BY alert_date DESC, alert_uid DESC
+LIMIT $2
+"""
+
+def parse_bucket_interval(bucket: str) -> timedelta:
+    """버킷 간격 문자열 파싱 (예: 30s, 5m, 1h, 1d, 1w)"""
+    bucket = (bucket or "").strip().lower()
+    unit = BUCKET_UNITS.get(bucket[-1:]) if bucket else None
+    if unit is None or not bucket[:-1].isdigit() or int(bucket[:-1]) <= 0:
+        raise HTTPException(status_code=400, detail=f"올바르지 않은 버킷 간격입니다: {bucket} (예: 5m, 1h, 1d)")
+    return unit * int(bucket[:-1])
+
+def auto_bucket_interval(start: datetime, end: datetime, points: int) -> timedelta:
+    """구간을 points개 이하 버킷으로 나누는 가장 작은 간격 선택 (ceil(구간 / 간격) <= points)"""
+    span = end - start
+    for interval in AUTO_BUCKETS:
+        if math.ceil(span / interval) <= points:
+            return interval
+    # 기본 간격으로 부족하면 일 단위로 올림하여 버킷 수가 points를 넘지 않도록
+    return timedelta(days=math.ceil(span / (timedelta(days=1) * points)))
+
+def to_local_naive(value: datetime) -> datetime:
+    """timezone 정보가 있는 시각을 서버 로컬 naive 시각으로 변환 (flow_time은 TIMESTAMP)"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+def floor_to_minute(value: datetime) -> datetime:
+    """분 단위 내림 - 동시에 들어온 요청이 같은 쿼리 인자를 갖도록 정규화"""
+    return value.replace(second=0, microsecond=0)
+
+def encode_alert_cursor(alert_date: datetime, alert_uid: int) -> str:
+    """알람 페이지 커서 생성 ((alert_date, alert_uid)를 URL-safe 문자열로)"""
+    raw = f"{alert_date.isoformat()}|{alert_uid}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_alert_cursor(cursor: str) -> tuple:
+    """알람 페이지 커서 해석 -> (alert_date, alert_uid)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_part, uid_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_part), int(uid_part)
+    except Exception:
+        raise HTTPException(status_code=400, detail="올바르지 않은 알람 커서입니다")
+
 class FlowService:
     def __init__(self, flow_uid: int = 1):
         self.flow_uid = flow_uid  # 기본값 1, 나중에 동적으로 변경 가능
 
+    async def _shared_query(self, method: str, query: str, *args, generation: int = None, resource: str = None):
+        """읽기 쿼리 실행 - 같은 쿼리/인자의 동시 호출은 하나의 DB 조회와 결과를 공유
+
+        대시보드 여러 개가 같은 지점을 같은 주기로 폴링해도 DB 부하는 지점 수에 비례한다.
+        generation(캐시 세대)을 넘기면 무효화 이전에 시작된 조회에는 합류하지 않는다.
+        resource를 넘기면 현재 데이터 버전(ETag 기준)을 키에 포함하여, 버전이 오른 뒤의 요청이
+        쓰기 이전에 시작된 조회 결과를 새 ETag로 받지 않도록 한다.
+        """
+        version = data_versions.get(resource, self.flow_uid) if resource else None
+        async def run():
+            db_pool = get_db_pool()
+            async with db_pool.acquire() as conn:
+                return await getattr(conn, method)(query, *args)
+
+        return await query_single_flight.do((method, query, args, generation, version), run)
+
     async def get_latest_flow_data(self, location_id: str = None) -> Dict:
         """최신 하천 데이터 조회 (AI 실시간 데이터 우선)"""
         
@@ -51,55 +163,55 @@ class FlowService:
             }
         
         # 2. AI 데이터가 없으면 DB에서 조회 (폴백)
-        db_pool = get_db_pool()
+        try:
+            # 최신 데이터 1건 조회 - 최근 파티션만 먼저 조회하고, 없을 때만 전체 파티션 조회
+            query = LATEST_FLOW_QUERY
 
-        async with db_pool.acquire() as conn:
-            try:
-                # 최신 데이터 1건 조회
-                query = """
-                SELECT 
-                    flow_rate,
-                    flow_flux, 
-                    flow_waterlevel,
-                    flow_time
-                FROM flow_detail_info 
-                WHERE flow_uid = $1 
-                ORDER BY flow_time DESC 
-                LIMIT 1
-                """
-
-                row = await conn.fetchrow(query, self.flow_uid)
-
-                if not row:
-                    return {
-                        "flow_rate": 0.0,
-                        "flow_flux": 0.0,
-                        "flow_waterlevel": 0.0,
-                        "flow_time": datetime.now().isoformat(),
-                        "status": "no_data",
-                        "data_source": "database_fallback",
-                        "connection_status": "disconnected",
-                        "message": "연결 대기 중"
-                    }
+            recent_start = floor_to_minute(datetime.now() - LATEST_LOOKBACK)
+            row = await self._shared_query("fetchrow", query, self.flow_uid, recent_start, resource=RESOURCE_TIMESERIES)
+            if not row:
+                row = await self._shared_query("fetchrow", query, self.flow_uid, datetime.min, resource=RESOURCE_TIMESERIES)
 
+            if not row:
                 return {
-                    "flow_rate": float(row['flow_rate']) / 10,  # DB값을 10으로 나누어 m/s로 변환
-                    "flow_flux": float(row['flow_flux']),  # 유량 (m³/s)
-                    "flow_waterlevel": float(row['flow_waterlevel']),  # 수위 (cm)
-                    "flow_time": row['flow_time'].isoformat(),
-                    "status": "success",
-                    "data_source": "database",
+                    "flow_rate": 0.0,
+                    "flow_flux": 0.0,
+                    "flow_waterlevel": 0.0,
+                    "flow_time": datetime.now().isoformat(),
+                    "status": "no_data",
+                    "data_source": "database_fallback",
                     "connection_status": "disconnected",
-                    "message": "과거 데이터 (AI 서버 연결 안됨)"
+                    "message": "연결 대기 중"
                 }
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"데이터베이스 조회 오류: {str(e)}")
-
-    async def get_timeseries_data(self, location_id: str = None, time_range: str = "1h") -> Dict:
-        """시계열 데이터 조회"""
-        db_pool = get_db_pool()
+            return {
+                "flow_rate": float(row['flow_rate']) / 10,  # DB값을 10으로 나누어 m/s로 변환
+                "flow_flux": float(row['flow_flux']),  # 유량 (m³/s)
+                "flow_waterlevel": float(row['flow_waterlevel']),  # 수위 (cm)
+                "flow_time": row['flow_time'].isoformat(),
+                "status": "success",
+                "data_source": "database",
+                "connection_status": "disconnected",
+                "message": "과거 데이터 (AI 서버 연결 안됨)"
+            }
 
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"데이터베이스 조회 오류: {str(e)}")
+
+    async def get_timeseries_data(
+            self,
+            location_id: str = None,
+            time_range: str = "1h",
+            points: int = 200,
+            response_format: str = "rows",
+            packed: bool = False
+    ) -> Dict:
+        """시계열 데이터 조회 (전체 구간 조회 후 points개로 LTTB 다운샘플링)
+
+        response_format:
+            rows: 지표별 점 목록 (표시용 라벨 포함)
+            columnar: 공통 epoch ms 타임스탬프 배열 + 지표별 float 배열 (라벨은 클라이언트에서 생성)
+        """
         # 시간 범위 계산
         time_delta_map = {
             "1h": timedelta(hours=1),
@@ -111,113 +223,241 @@ class FlowService:
         }
 
         delta = time_delta_map.get(time_range, timedelta(hours=1))
-        start_time = datetime.now() - delta
+        start_time = floor_to_minute(datetime.now() - delta)
 
-        async with db_pool.acquire() as conn:
-            try:
-                query = """
-                SELECT 
-                    flow_rate,
-                    flow_flux,
-                    flow_waterlevel,
-                    flow_time
-                FROM (
-                    SELECT 
-                        flow_rate,
-                        flow_flux,
-                        flow_waterlevel,
-                        flow_time
-                    FROM flow_detail_info 
-                    WHERE flow_uid = $1 
-                        AND flow_time >= $2
-                    ORDER BY flow_time DESC
-                    LIMIT 10
-                ) subquery
-                ORDER BY flow_time ASC
-                """
+        try:
+            query = TIMESERIES_QUERY
 
-                rows = await conn.fetch(query, self.flow_uid, start_time)
+            rows = await self._shared_query("fetch", query, self.flow_uid, start_time, resource=RESOURCE_TIMESERIES)
 
-                # 데이터 포맷팅
-                water_level_data = []
-                flow_velocity_data = []
-                discharge_data = []
-                
-                prev_date = None
-
-                for row in rows:
-                    current_date = row['flow_time'].date()
-                    time_str = row['flow_time'].strftime('%H:%M')
-                    timestamp = row['flow_time'].isoformat()
-                    
-                    # 날짜가 바뀌었는지 확인
-                    date_changed = prev_date is None or current_date != prev_date
-                    display_text = f"{current_date.strftime('%m/%d')} {time_str}" if date_changed else time_str
-                    
-                    water_level_data.append({
-                        "t": display_text,
-                        "time_only": time_str,
-                        "date_changed": date_changed,
-                        "h": float(row['flow_waterlevel']),
-                        "timestamp": timestamp
-                    })
-
-                    flow_velocity_data.append({
-                        "t": display_text,
-                        "time_only": time_str,
-                        "date_changed": date_changed,
-                        "v": float(row['flow_rate']) / 10  # DB값을 10으로 나누어 m/s로 변환
-                    })
-
-                    discharge_data.append({
-                        "t": display_text,
-                        "time_only": time_str,
-                        "date_changed": date_changed,
-                        "q": float(row['flow_flux'])
-                    })
-                    
-                    prev_date = current_date
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"시계열 데이터 조회 오류: {str(e)}")
 
-                return {
-                    "waterLevel": water_level_data,
-                    "flowVelocity": flow_velocity_data,
-                    "discharge": discharge_data,
-                    "status": "success"
-                }
+        total_count = len(rows)
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"시계열 데이터 조회 오류: {str(e)}")
+        # 차트 모양을 유지하면서 응답 크기를 points개로 고정 (수위 기준으로 선택, 세 지표 공통 적용)
+        if points and total_count > points:
+            x = np.fromiter((row['flow_time'].timestamp() for row in rows), dtype=np.float64, count=total_count)
+            y = np.fromiter((row['flow_waterlevel'] for row in rows), dtype=np.float64, count=total_count)
+            rows = [rows[i] for i in lttb_indices(x, y, points)]
 
-    async def get_flow_info(self) -> Dict:
-        """하천 정보 조회"""
-        db_pool = get_db_pool()
+        if response_format == "columnar":
+            return self._build_columnar_timeseries(rows, total_count, packed)
 
-        async with db_pool.acquire() as conn:
-            try:
-                query = """
-                SELECT
-                    flow_name,
-                    flow_latitude,
-                    flow_longitude,
-                    flow_region,
-                    flow_address
-                FROM flow_info
-                WHERE flow_uid = $1
-                """
+        # 데이터 포맷팅
+        water_level_data = []
+        flow_velocity_data = []
+        discharge_data = []
+        
+        prev_date = None
+
+        for row in rows:
+            current_date = row['flow_time'].date()
+            time_str = row['flow_time'].strftime('%H:%M')
+            timestamp = row['flow_time'].isoformat()
+            
+            # 날짜가 바뀌었는지 확인
+            date_changed = prev_date is None or current_date != prev_date
+            display_text = f"{current_date.strftime('%m/%d')} {time_str}" if date_changed else time_str
+            
+            water_level_data.append({
+                "t": display_text,
+                "time_only": time_str,
+                "date_changed": date_changed,
+                "h": float(row['flow_waterlevel']),
+                "timestamp": timestamp
+            })
+
+            flow_velocity_data.append({
+                "t": display_text,
+                "time_only": time_str,
+                "date_changed": date_changed,
+                "v": float(row['flow_rate']) / 10  # DB값을 10으로 나누어 m/s로 변환
+            })
+
+            discharge_data.append({
+                "t": display_text,
+                "time_only": time_str,
+                "date_changed": date_changed,
+                "q": float(row['flow_flux'])
+            })
+            
+            prev_date = current_date
+
+        return {
+            "waterLevel": water_level_data,
+            "flowVelocity": flow_velocity_data,
+            "discharge": discharge_data,
+            "total_count": total_count,
+            "status": "success"
+        }
 
-                row = await conn.fetchrow(query, self.flow_uid)
+    async def get_bucketed_timeseries(
+            self,
+            start: datetime,
+            end: Optional[datetime] = None,
+            bucket: Optional[str] = None,
+            points: int = 200
+    ) -> Dict:
+        """임의 구간 시계열 조회 - DB에서 버킷별 avg/min/max 집계 (date_bin, PostgreSQL 14+)"""
+        start = to_local_naive(start)
+        # 종료 시각 생략 시 다음 분 경계까지 포함 (동시 요청의 쿼리 인자 통일)
+        end = to_local_naive(end) if end else floor_to_minute(datetime.now()) + timedelta(minutes=1)
+
+        if end <= start:
+            raise HTTPException(status_code=400, detail="종료 시각은 시작 시각보다 늦어야 합니다")
+
+        interval = parse_bucket_interval(bucket) if bucket else auto_bucket_interval(start, end, points)
+        if (end - start) / interval > MAX_BUCKETS:
+            raise HTTPException(status_code=400, detail=f"버킷 개수가 너무 많습니다 (최대 {MAX_BUCKETS}개)")
 
-                if not row:
-                    return {
-                        "flow_name": "영오지하차도",
-                        "flow_latitude": 35.923508,
-                        "flow_longitude": 128.519230,
-                        "flow_region": "칠곡",
-                        "flow_address": "경북 칠곡군 지천면 영오리 894",
-                        "status": "default"
-                    }
+        try:
+            query = """
+            SELECT
+                date_bin($4::interval, flow_time, $2::timestamp) AS bucket,
+                COUNT(*) AS samples,
+                AVG(flow_waterlevel) AS h_avg,
+                MIN(flow_waterlevel) AS h_min,
+                MAX(flow_waterlevel) AS h_max,
+                AVG(flow_rate) / 10 AS v_avg,
+                MIN(flow_rate) / 10 AS v_min,
+                MAX(flow_rate) / 10 AS v_max,
+                AVG(flow_flux) AS q_avg,
+                MIN(flow_flux) AS q_min,
+                MAX(flow_flux) AS q_max
+            FROM flow_detail_info
+            WHERE flow_uid = $1
+                AND flow_time >= $2
+                AND flow_time < $3
+            GROUP BY bucket
+            ORDER BY bucket
+            """
+
+            rows = await self._shared_query("fetch", query, self.flow_uid, start, end, interval, resource=RESOURCE_TIMESERIES)
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"구간 집계 조회 오류: {str(e)}")
+
+        def column(name: str) -> List[Optional[float]]:
+            return [float(row[name]) if row[name] is not None else None for row in rows]
+
+        return {
+            "format": "buckets",
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "bucket_seconds": int(interval.total_seconds()),
+            "t": [int(row['bucket'].timestamp() * 1000) for row in rows],  # 버킷 시작 epoch ms
+            "samples": [row['samples'] for row in rows],
+            "h": {"avg": column('h_avg'), "min": column('h_min'), "max": column('h_max')},
+            "v": {"avg": column('v_avg'), "min": column('v_min'), "max": column('v_max')},
+            "q": {"avg": column('q_avg'), "min": column('q_min'), "max": column('q_max')},
+            "status": "success"
+        }
 
-                return {
+    async def get_daily_stats(self, start: date, end: date) -> Dict:
+        """일별 통계 조회 (flow_daily_stats - 하루 1행)"""
+        try:
+            query = """
+            SELECT
+                stat_date, sample_count,
+                min_level, max_level, avg_level, p95_level,
+                peak_velocity, discharge_volume,
+                minutes_above_warning, minutes_above_danger
+            FROM flow_daily_stats
+            WHERE flow_uid = $1 AND stat_date BETWEEN $2 AND $3
+            ORDER BY stat_date ASC
+            """
+
+            rows = await self._shared_query("fetch", query, self.flow_uid, start, end, resource=RESOURCE_TIMESERIES)
+
+            days = []
+            for row in rows:
+                day = dict(row)
+                day['stat_date'] = row['stat_date'].isoformat()
+                days.append(day)
+
+            return {
+                "flow_uid": self.flow_uid,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "days": days,
+                "count": len(days),
+                "status": "success"
+            }
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"일별 통계 조회 오류: {str(e)}")
+
+    def _build_columnar_timeseries(self, rows: List, total_count: int, packed: bool = False) -> Dict:
+        """컬럼형 시계열 응답 생성
+
+        t: epoch ms, h: 수위(cm), v: 유속(m/s), q: 유량(m³/s)
+        packed=True이면 배열을 little-endian 바이너리의 base64 문자열로 전송 (t는 float64, 지표는 float32)
+        """
+        count = len(rows)
+        t = np.fromiter((row['flow_time'].timestamp() * 1000 for row in rows), dtype=np.float64, count=count)
+        h = np.fromiter((row['flow_waterlevel'] for row in rows), dtype=np.float64, count=count)
+        v = np.fromiter((row['flow_rate'] for row in rows), dtype=np.float64, count=count) / 10  # m/s
+        q = np.fromiter((row['flow_flux'] for row in rows), dtype=np.float64, count=count)
+
+        result = {
+            "format": "columnar",
+            "count": count,
+            "total_count": total_count,
+            "status": "success"
+        }
+
+        if packed:
+            result.update({
+                "encoding": "base64",
+                "dtypes": {"t": "float64-le", "h": "float32-le", "v": "float32-le", "q": "float32-le"},
+                "t": base64.b64encode(t.astype('<f8').tobytes()).decode('ascii'),
+                "h": base64.b64encode(h.astype('<f4').tobytes()).decode('ascii'),
+                "v": base64.b64encode(v.astype('<f4').tobytes()).decode('ascii'),
+                "q": base64.b64encode(q.astype('<f4').tobytes()).decode('ascii')
+            })
+        else:
+            result.update({
+                "t": t.astype(np.int64).tolist(),
+                "h": h.tolist(),
+                "v": v.tolist(),
+                "q": q.tolist()
+            })
+
+        return result
+
+    async def get_flow_info(self) -> Dict:
+        """하천 정보 조회 (관리자 수정 시 무효화되는 캐시 사용)"""
+        cached = reference_cache.get(flow_info_key(self.flow_uid), None)
+        if cached is not None:
+            return cached
+        generation = reference_cache.generation
+
+        try:
+            query = """
+            SELECT
+                flow_name,
+                flow_latitude,
+                flow_longitude,
+                flow_region,
+                flow_address
+            FROM flow_info
+            WHERE flow_uid = $1
+            """
+
+            row = await self._shared_query("fetchrow", query, self.flow_uid, generation=generation)
+
+            if not row:
+                result = {
+                    "flow_name": "영오지하차도",
+                    "flow_latitude": 35.923508,
+                    "flow_longitude": 128.519230,
+                    "flow_region": "칠곡",
+                    "flow_address": "경북 칠곡군 지천면 영오리 894",
+                    "status": "default"
+                }
+            else:
+                result = {
                     "flow_name": row['flow_name'] or "영오지하차도",
                     "flow_latitude": float(row['flow_latitude']),
                     "flow_longitude": float(row['flow_longitude']),
@@ -226,95 +466,229 @@ class FlowService:
                     "status": "success"
                 }
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"하천 정보 조회 오류: {str(e)}")
+            reference_cache.set(flow_info_key(self.flow_uid), result, generation=generation)
+            return result
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"하천 정보 조회 오류: {str(e)}")
 
     async def get_cameras_by_flow_uid(self, flow_uid: int) -> Dict:
-        """특정 하천의 카메라 목록 조회"""
-        db_pool = get_db_pool()
+        """특정 하천의 카메라 목록 조회 (관리자 수정 시 무효화되는 캐시 사용)"""
+        cached = reference_cache.get(cameras_key(flow_uid), None)
+        if cached is not None:
+            return cached
+        generation = reference_cache.generation
 
-        async with db_pool.acquire() as conn:
-            try:
-                query = """
-                SELECT
-                    camera_ip,
-                    camera_name
-                FROM camera_info
-                WHERE flow_uid = $1
-                ORDER BY camera_name
-                """
+        try:
+            query = """
+            SELECT
+                camera_ip,
+                camera_name
+            FROM camera_info
+            WHERE flow_uid = $1
+            ORDER BY camera_name
+            """
+
+            rows = await self._shared_query("fetch", query, flow_uid, generation=generation)
+
+            cameras = []
+            for row in rows:
+                camera_id = str(row['camera_ip']).replace('.', '_')
+                cameras.append({
+                    "id": camera_id,
+                    "name": row['camera_name'],
+                    "status": "online"
+                })
+
+            result = {
+                "cameras": cameras,
+                "status": "success"
+            }
+            reference_cache.set(cameras_key(flow_uid), result, generation=generation)
+            return result
 
-                rows = await conn.fetch(query, flow_uid)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"카메라 정보 조회 오류: {str(e)}")
 
-                cameras = []
-                for row in rows:
-                    camera_id = str(row['camera_ip']).replace('.', '_')
-                    cameras.append({
-                        "id": camera_id,
-                        "name": row['camera_name'],
-                        "status": "online"
-                    })
+    async def get_stations_snapshot(self) -> Dict:
+        """전체 지점 현황 조회 (지점별 최신 측정값 + 경보 단계)
 
-                return {
-                    "cameras": cameras,
-                    "status": "success"
-                }
+        flow_info 전체를 LATERAL 조인으로 지점별 최신 flow_detail_info 1건과 함께 한 번에 조회하고,
+        AI 실시간 데이터가 있는 지점은 버퍼의 최신값으로 대체한다.
+        """
+        try:
+            query = """
+            WITH thresholds AS (
+                SELECT s.warning_level, s.danger_level
+                FROM settings s
+                JOIN users u ON u.user_uid = s.user_uid
+                WHERE u.user_level = 0
+                LIMIT 1
+            )
+            SELECT
+                f.flow_uid,
+                f.flow_name,
+                f.flow_latitude,
+                f.flow_longitude,
+                f.flow_region,
+                f.flow_address,
+                d.flow_rate,
+                d.flow_flux,
+                d.flow_waterlevel,
+                d.flow_time,
+                t.warning_level,
+                t.danger_level
+            FROM flow_info f
+            LEFT JOIN LATERAL (
+                SELECT flow_rate, flow_flux, flow_waterlevel, flow_time
+                FROM flow_detail_info
+                WHERE flow_uid = f.flow_uid
+                ORDER BY flow_time DESC
+                LIMIT 1
+            ) d ON true
+            LEFT JOIN thresholds t ON true
+            ORDER BY f.flow_uid
+            """
+
+            rows = await self._shared_query("fetch", query)
+
+            live_data = ai_data_buffer.get_latest_data_for_kpi()
+            stations = []
+            for row in rows:
+                warning_level = row['warning_level'] or 10  # cm - 주의 수위
+                danger_level = row['danger_level'] or 15    # cm - 위험 수위
+
+                if live_data and row['flow_uid'] == ai_data_buffer.flow_uid:
+                    measurement = {
+                        "flow_rate": float(live_data['flow_rate']) / 10,  # DB값을 10으로 나누어 m/s로 변환
+                        "flow_flux": float(live_data['flow_flux']),
+                        "flow_waterlevel": float(live_data['flow_waterlevel']),
+                        "flow_time": live_data['flow_time'],
+                        "data_source": "ai_realtime"
+                    }
+                elif row['flow_time'] is not None:
+                    measurement = {
+                        "flow_rate": float(row['flow_rate']) / 10,  # DB값을 10으로 나누어 m/s로 변환
+                        "flow_flux": float(row['flow_flux']),
+                        "flow_waterlevel": float(row['flow_waterlevel']),
+                        "flow_time": row['flow_time'].isoformat(),
+                        "data_source": "database"
+                    }
+                else:
+                    measurement = {
+                        "flow_rate": None,
+                        "flow_flux": None,
+                        "flow_waterlevel": None,
+                        "flow_time": None,
+                        "data_source": "no_data"
+                    }
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"카메라 정보 조회 오류: {str(e)}")
+                water_level = measurement['flow_waterlevel']
+                if water_level is None:
+                    alert_level = "unknown"
+                elif water_level > danger_level:
+                    alert_level = "danger"
+                elif water_level > warning_level:
+                    alert_level = "warning"
+                else:
+                    alert_level = "safe"
+
+                stations.append({
+                    "flow_uid": row['flow_uid'],
+                    "flow_name": row['flow_name'],
+                    "flow_latitude": float(row['flow_latitude']) if row['flow_latitude'] is not None else None,
+                    "flow_longitude": float(row['flow_longitude']) if row['flow_longitude'] is not None else None,
+                    "flow_region": row['flow_region'],
+                    "flow_address": row['flow_address'],
+                    **measurement,
+                    "alert_level": alert_level
+                })
 
-    async def get_recent_alerts(self, limit: int = 10) -> Dict:
-        """최근 알람 조회"""
-        db_pool = get_db_pool()
+            return {
+                "stations": stations,
+                "count": len(stations),
+                "status": "success"
+            }
 
-        async with db_pool.acquire() as conn:
-            try:
-                query = """
-                SELECT 
-                    alert_uid,
-                    alert_date,
-                    alert_message,
-                    alert_type
-                FROM alert_info 
-                WHERE flow_uid = $1
-                ORDER BY alert_date DESC 
-                LIMIT $2
-                """
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"전체 지점 현황 조회 오류: {str(e)}")
 
-                rows = await conn.fetch(query, self.flow_uid, limit)
-
-                alerts = []
-                for row in rows:
-                    # alert_type 매핑
-                    level_map = {
-                        "긴급": "CRITICAL",
-                        "주의": "WARNING",
-                        "경계": "WARNING",
-                        "대피": "CRITICAL",
-                        "정상": "INFO"
-                    }
+    async def get_recent_alerts(self, limit: int = 10, before: str = None, since: str = None) -> Dict:
+        """최근 알람 조회 - (alert_date, alert_uid) 기준 keyset 페이지네이션
 
-                    alert_level = level_map.get(row['alert_type'], "INFO")
+        before: 이 커서보다 오래된 알람 (이전 페이지, next_cursor 사용)
+        since: 이 커서보다 새로운 알람만 (증분 폴링, latest_cursor 사용)
+        """
+        if before and since:
+            raise HTTPException(status_code=400, detail="before와 since는 동시에 지정할 수 없습니다")
 
-                    alerts.append({
-                        "id": f"AL-{row['alert_uid']:03d}",
-                        "ts": row['alert_date'].strftime('%H:%M') if row['alert_date'] else "",
-                        "level": alert_level,
-                        "message": row['alert_message'] or "",
-                        "location": "중앙"  # 기본값
-                    })
+        try:
+            if since:
+                # 증분 조회는 오래된 것부터 채워야 다음 폴링에서 빠짐없이 이어진다
+                since_date, since_uid = decode_alert_cursor(since)
+                query = """
+                SELECT alert_uid, alert_date, alert_message, alert_type
+                FROM alert_info
+                WHERE flow_uid = $1 AND (alert_date, alert_uid) > ($2, $3)
+                ORDER BY alert_date ASC, alert_uid ASC
+                LIMIT $4
+                """
+                rows = await self._shared_query("fetch", query, self.flow_uid, since_date, since_uid, limit + 1, resource=RESOURCE_ALERTS)
+                has_more = len(rows) > limit
+                rows = list(reversed(rows[:limit]))
+            else:
+                if before:
+                    before_date, before_uid = decode_alert_cursor(before)
+                    query = """
+                    SELECT alert_uid, alert_date, alert_message, alert_type
+                    FROM alert_info
+                    WHERE flow_uid = $1 AND (alert_date, alert_uid) < ($2, $3)
+                    ORDER BY alert_date DESC, alert_uid DESC
+                    LIMIT $4
+                    """
+                    args = (self.flow_uid, before_date, before_uid, limit + 1)
+                else:
+                    query = RECENT_ALERTS_QUERY
+                    args = (self.flow_uid, limit + 1)
+                rows = await self._shared_query("fetch", query, *args, resource=RESOURCE_ALERTS)
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+
+            alerts = []
+            for row in rows:
+                alerts.append({
+                    "id": f"AL-{row['alert_uid']:03d}",
+                    "ts": row['alert_date'].strftime('%H:%M') if row['alert_date'] else "",
+                    "level": self._map_alert_level(row['alert_type']),
+                    "message": row['alert_message'] or "",
+                    "location": "중앙"  # 기본값
+                })
+
+            keyed_rows = [row for row in rows if row['alert_date'] is not None]
+            if keyed_rows:
+                latest_cursor = encode_alert_cursor(keyed_rows[0]['alert_date'], keyed_rows[0]['alert_uid'])
+                oldest_cursor = encode_alert_cursor(keyed_rows[-1]['alert_date'], keyed_rows[-1]['alert_uid'])
+            else:
+                # 새 알람이 없으면 받은 커서를 그대로 유지
+                latest_cursor = since
+                oldest_cursor = None
 
-                return {
-                    "alerts": alerts,
-                    "status": "success"
-                }
+            return {
+                "alerts": alerts,
+                "has_more": has_more,
+                "next_cursor": oldest_cursor if has_more and not since else None,
+                "latest_cursor": latest_cursor,
+                "status": "success"
+            }
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"알람 조회 오류: {str(e)}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"알람 조회 오류: {str(e)}")
 
     async def add_alert(self, alert_message: str, alert_type: str = "주의") -> Dict:
         """새로운 알람 추가 및 WebSocket 브로드캐스트"""
-        from app.routers.websocket import broadcast_alert_update
+        from app.services.event_bus import event_bus, TOPIC_ALERT
         
         db_pool = get_db_pool()
 
@@ -344,8 +718,12 @@ class FlowService:
                     "location": "중앙"
                 }
 
-                # WebSocket으로 실시간 브로드캐스트
-                await broadcast_alert_update("alert_added", new_alert)
+                # 이 워커의 알람 버전을 즉시 갱신하고, 모든 워커의 WebSocket 클라이언트로 브로드캐스트
+                version = data_versions.bump(RESOURCE_ALERTS, self.flow_uid)
+                await event_bus.publish(TOPIC_ALERT, {
+                    "alert_type": "alert_added", "data": new_alert,
+                    "flow_uid": self.flow_uid, "version": version
+                })
 
 
                 return {
@@ -358,7 +736,7 @@ class FlowService:
 
     async def delete_alert(self, alert_uid: int) -> Dict:
         """알람 삭제 및 WebSocket 브로드캐스트"""
-        from app.routers.websocket import broadcast_alert_update
+        from app.services.event_bus import event_bus, TOPIC_ALERT
         
         db_pool = get_db_pool()
 
@@ -387,8 +765,12 @@ class FlowService:
                     "level": self._map_alert_level(alert_row['alert_type'])
                 }
 
-                # WebSocket으로 실시간 브로드캐스트
-                await broadcast_alert_update("alert_deleted", deleted_alert)
+                # 이 워커의 알람 버전을 즉시 갱신하고, 모든 워커의 WebSocket 클라이언트로 브로드캐스트
+                version = data_versions.bump(RESOURCE_ALERTS, self.flow_uid)
+                await event_bus.publish(TOPIC_ALERT, {
+                    "alert_type": "alert_deleted", "data": deleted_alert,
+                    "flow_uid": self.flow_uid, "version": version
+                })
 
                 return {
                     "deleted_alert": deleted_alert,
@@ -0,0 +1,243 @@
+# app/services/partition_maintenance.py
+import asyncio
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from app.database import get_db_pool
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "flow_detail_info"
+LEGACY_TABLE = "flow_detail_info_legacy"
+DEFAULT_PARTITION = "flow_detail_info_default"
+FLOW_COLUMNS = "id, flow_uid, flow_rate, flow_flux, flow_waterlevel, flow_time"
+PARTITION_PATTERN = re.compile(r"^flow_detail_info_(\d{4})(\d{2})$")
+
+# 여러 워커 중 한 워커만 정리 작업을 수행하도록 하는 advisory lock 키
+MAINTENANCE_LOCK_KEY = 72_410_002
+
+
+def add_months(month: date, months: int) -> date:
+    """월 단위 이동 (항상 1일 반환)"""
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month.strftime('%Y%m')}"
+
+
+class PartitionMaintenance:
+    """flow_detail_info 월 파티션 관리
+
+    - 이번 달부터 FLOW_PARTITION_PREMAKE_MONTHS개월 뒤까지 파티션을 미리 생성
+    - FLOW_PARTITION_DETACH_MONTHS개월보다 오래된 파티션은 분리 (보관용, 조회 대상에서 제외)
+    - FLOW_PARTITION_DROP_MONTHS개월보다 오래된 파티션은 삭제 (분리된 파티션 포함)
+    보관 기간이 0이면 해당 단계는 수행하지 않는다.
+
+    파티션 전환(마이그레이션 v3) 직후에는 flow_detail_info_legacy에 남은 기존 데이터를
+    FLOW_PARTITION_BACKFILL_BATCH행씩 짧은 트랜잭션으로 옮기고, 다 옮기면 legacy 테이블을 삭제한다.
+    """
+
+    def __init__(self):
+        self.interval = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "21600"))
+        self.premake_months = int(os.getenv("FLOW_PARTITION_PREMAKE_MONTHS", "3"))
+        self.detach_months = int(os.getenv("FLOW_PARTITION_DETACH_MONTHS", "0"))
+        self.drop_months = int(os.getenv("FLOW_PARTITION_DROP_MONTHS", "0"))
+        self.backfill_batch = int(os.getenv("FLOW_PARTITION_BACKFILL_BATCH", "5000"))
+        self.backfill_batches_per_run = int(os.getenv("FLOW_PARTITION_BACKFILL_BATCHES_PER_RUN", "20"))
+        # 옮길 데이터가 남아 있는 동안의 실행 간격 (초)
+        self.backfill_pause = float(os.getenv("FLOW_PARTITION_BACKFILL_PAUSE", "1"))
+
+        self.task: Optional[asyncio.Task] = None
+        self.last_run: Optional[str] = None
+        self.last_result: Dict[str, List[str]] = {}
+        self.backfill_pending = False
+        self.backfilled_rows = 0
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+
+    async def _maintenance_loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"파티션 관리 실패: {e}")
+            await asyncio.sleep(self.backfill_pause if self.backfill_pending else self.interval)
+
+    async def _create_partition(self, conn, month: date) -> str:
+        """월 파티션 생성 - 기본 파티션에 그 달의 행이 있으면 같은 트랜잭션에서 새 파티션으로 옮긴다
+
+        (기본 파티션에 해당 범위의 행이 있으면 PostgreSQL이 PARTITION OF 생성을 거부하므로,
+        기본 파티션을 잠시 분리하고 파티션을 만든 뒤 행을 옮기고 다시 연결한다)
+        """
+        name = partition_name(month)
+        start, end = month, add_months(month, 1)
+        create_sql = (
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+        has_default = await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM pg_class WHERE relname = $1)", DEFAULT_PARTITION
+        )
+        stranded = has_default and await conn.fetchval(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE flow_time >= $1 AND flow_time < $2)",
+            start, end
+        )
+        if not stranded:
+            await conn.execute(create_sql)
+            return name
+
+        async with conn.transaction():
+            await conn.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+            await conn.execute(create_sql)
+            status = await conn.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION} WHERE flow_time >= $1 AND flow_time < $2
+                    RETURNING {FLOW_COLUMNS}
+                )
+                INSERT INTO {PARENT_TABLE} ({FLOW_COLUMNS})
+                SELECT {FLOW_COLUMNS} FROM moved
+            """, start, end)
+            await conn.execute(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+        logger.info(f"기본 파티션의 {name} 범위 행 {status.split()[-1]}건을 새 파티션으로 이동")
+        return name
+
+    async def _try_create_partition(self, conn, month: date, existing: set, result: Dict[str, List[str]]) -> bool:
+        """파티션 생성 (실패해도 다른 달과 이후 단계는 계속 진행 - 다음 실행에서 다시 시도)"""
+        name = partition_name(month)
+        try:
+            await self._create_partition(conn, month)
+        except Exception as e:
+            logger.error(f"파티션 생성 실패 ({name}): {e}")
+            result["failed"].append(name)
+            return False
+        existing.add(name)
+        result["created"].append(name)
+        return True
+
+    async def _backfill_legacy(self, conn, existing: set, result: Dict[str, List[str]]) -> int:
+        """legacy 테이블의 기존 데이터를 배치 단위로 파티션 테이블로 이동 (배치마다 별도 트랜잭션)"""
+        moved_total = 0
+        for _ in range(self.backfill_batches_per_run):
+            rows = await conn.fetch(
+                f"SELECT id, flow_time FROM {LEGACY_TABLE} ORDER BY id LIMIT $1", self.backfill_batch
+            )
+            if not rows:
+                await conn.execute(f"DROP TABLE {LEGACY_TABLE}")
+                self.backfill_pending = False
+                logger.info(f"기존 측정 이력 이동 완료 - {LEGACY_TABLE} 삭제")
+                break
+
+            # 옮길 행이 속한 달의 파티션이 없으면 먼저 생성 (기본 파티션으로 들어가지 않도록)
+            for month in {row['flow_time'].date().replace(day=1) for row in rows if row['flow_time'] is not None}:
+                if partition_name(month) not in existing:
+                    # 생성에 실패하면 해당 행은 기본 파티션으로 들어가고, 파티션 생성 시 다시 옮겨진다
+                    await self._try_create_partition(conn, month, existing, result)
+
+            async with conn.transaction():
+                status = await conn.execute(f"""
+                    WITH moved AS (
+                        DELETE FROM {LEGACY_TABLE} WHERE id = ANY($1::bigint[])
+                        RETURNING id, flow_uid, flow_rate, flow_flux, flow_waterlevel, flow_time
+                    )
+                    INSERT INTO {PARENT_TABLE} (id, flow_uid, flow_rate, flow_flux, flow_waterlevel, flow_time)
+                    SELECT id, flow_uid, flow_rate, flow_flux, flow_waterlevel, COALESCE(flow_time, NOW())
+                    FROM moved
+                """, [row['id'] for row in rows])
+            moved_total += int(status.split()[-1])
+        self.backfilled_rows += moved_total
+        return moved_total
+
+    async def run_once(self, today: date = None) -> Dict[str, List[str]]:
+        """파티션 생성/분리/삭제 1회 수행 (다른 워커가 수행 중이면 건너뜀)"""
+        current_month = (today or date.today()).replace(day=1)
+        result = {"created": [], "detached": [], "dropped": [], "failed": []}
+
+        db_pool = get_db_pool()
+        async with db_pool.acquire() as conn:
+            is_partitioned = await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_class WHERE relname = $1 AND relkind = 'p')", PARENT_TABLE
+            )
+            if not is_partitioned:
+                return result
+
+            if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", MAINTENANCE_LOCK_KEY):
+                return result
+            try:
+                attached = {row['relname'] for row in await conn.fetch("""
+                    SELECT c.relname
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    JOIN pg_class p ON p.oid = i.inhparent
+                    WHERE p.relname = $1
+                """, PARENT_TABLE)}
+                existing = {row['relname'] for row in await conn.fetch(
+                    "SELECT relname FROM pg_class WHERE relkind = 'r' AND relname LIKE $1",
+                    f"{PARENT_TABLE}\\_%"
+                )}
+
+                # 1. 다가올 달 파티션 미리 생성
+                for offset in range(self.premake_months + 1):
+                    month = add_months(current_month, offset)
+                    name = partition_name(month)
+                    if name in existing:
+                        continue
+                    await self._try_create_partition(conn, month, existing, result)
+
+                # 2. 보관 기간이 지난 파티션 분리/삭제
+                for name in sorted(existing):
+                    match = PARTITION_PATTERN.match(name)
+                    if not match:
+                        continue
+                    month = date(int(match.group(1)), int(match.group(2)), 1)
+                    age_months = (current_month.year - month.year) * 12 + (current_month.month - month.month)
+
+                    if self.drop_months and age_months >= self.drop_months:
+                        await conn.execute(f'DROP TABLE "{name}"')
+                        result["dropped"].append(name)
+                    elif self.detach_months and age_months >= self.detach_months and name in attached:
+                        await conn.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+                        result["detached"].append(name)
+
+                # 3. 파티션 전환 전 데이터 이동 (남아 있는 경우)
+                self.backfill_pending = LEGACY_TABLE in existing
+                if self.backfill_pending:
+                    result["backfilled"] = await self._backfill_legacy(conn, existing, result)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", MAINTENANCE_LOCK_KEY)
+
+        self.last_run = datetime.now().isoformat()
+        self.last_result = result
+        if any(result.values()):
+            logger.info(f"파티션 관리 완료: {result}")
+        return result
+
+    def get_stats(self) -> Dict:
+        return {
+            'running': self.task is not None and not self.task.done(),
+            'premake_months': self.premake_months,
+            'detach_months': self.detach_months,
+            'drop_months': self.drop_months,
+            'backfill_pending': self.backfill_pending,
+            'backfilled_rows': self.backfilled_rows,
+            'last_run': self.last_run,
+            'last_result': self.last_result
+        }
+
+# 싱글톤 인스턴스
+partition_maintenance = PartitionMaintenance()
@@ -0,0 +1,123 @@
+# app/services/realtime_publisher.py
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+from app.routers.websocket import manager
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+class RealtimePublisher:
+    """실시간 데이터 병합(conflation) 발행기
+
+    topic/key(지점)별 최신 메시지만 보관하고 tick 주기마다 한 번에 전송한다.
+    AI 추론 속도와 무관하게 WebSocket 전송량과 JSON 인코딩 횟수가 tick 주기로 제한되며,
+    화면에 표시되는 값은 최대 1 tick만큼만 지연된다. 알림 메시지는 이 경로를 거치지 않는다.
+    """
+
+    def __init__(self, default_interval: float = None):
+        if default_interval is None:
+            default_interval = float(os.getenv("WS_TICK_INTERVAL", "0.5"))
+        self.default_interval = default_interval
+
+        # topic별 tick 주기 (예: WS_TICK_INTERVAL_REALTIME_KPI_UPDATE=1.0)
+        self.topic_intervals: Dict[str, float] = {}
+
+        # topic -> {key: 최신 메시지}
+        self.latest: Dict[str, Dict[Any, dict]] = {}
+        self.last_flush: Dict[str, float] = {}
+
+        self.flush_task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.published_count = 0
+        self.flushed_count = 0
+
+    def get_interval(self, topic: str) -> float:
+        """topic별 tick 주기 반환 (환경변수 미설정 시 기본값)"""
+        if topic not in self.topic_intervals:
+            env_key = f"WS_TICK_INTERVAL_{topic.upper()}"
+            self.topic_intervals[topic] = float(os.getenv(env_key, self.default_interval))
+        return self.topic_intervals[topic]
+
+    def publish(self, topic: str, key: Any, message: dict):
+        """최신 메시지 등록 (이전에 전송되지 않은 같은 key의 메시지는 덮어씀)"""
+        self.latest.setdefault(topic, {})[key] = message
+        self.published_count += 1
+        self.start()
+
+    async def relay_event(self, payload: dict):
+        """이벤트 버스로 수신한 실시간 KPI 메시지를 이 워커의 클라이언트용으로 등록
+
+        버스가 이미 병합해서 보내는 경우(postgres)에는 tick을 한 번 더 기다리지 않고 바로 전송한다.
+        """
+        message = {key: value for key, value in payload.items() if key != 'bus_seq'}
+        topic, key = message['type'], message.get('data', {}).get('flow_uid')
+        if not event_bus.conflates_latest:
+            self.publish(topic, key, message)
+            return
+
+        self.published_count += 1
+        self.flushed_count += 1
+        self.start()  # 클라이언트별 최소 전송 간격으로 보류된 메시지는 flush 루프가 전송
+        await manager.broadcast_conflated(topic, {key: message})
+
+    def start(self):
+        """flush 루프 시작 (이미 실행 중이면 무시)"""
+        if self.flush_task and not self.flush_task.done():
+            return
+        self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """flush 루프 중지 후 남은 메시지 전송"""
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+        self.flush_task = None
+        await self.flush(force=True)
+
+    async def _flush_loop(self):
+        while True:
+            topics = set(self.latest) | manager.conflated_topics
+            tick = min([self.get_interval(topic) for topic in topics] or [self.default_interval])
+            await asyncio.sleep(tick)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"실시간 데이터 flush 실패: {e}")
+
+    async def flush(self, force: bool = False):
+        """tick 주기가 지난 topic의 최신 메시지 전송"""
+        now = time.monotonic()
+
+        for topic in set(self.latest) | manager.conflated_topics:
+            if not force and now - self.last_flush.get(topic, 0.0) < self.get_interval(topic):
+                continue
+
+            updates = self.latest.get(topic)
+            # 새 메시지도, 클라이언트별로 보류된 메시지도 없으면 건너뜀 (유휴 tick)
+            if not updates and not manager.has_pending(topic):
+                continue
+
+            self.latest[topic] = {}
+            self.last_flush[topic] = now
+            self.flushed_count += len(updates or {})
+            await manager.broadcast_conflated(topic, updates or {})
+
+    def get_stats(self) -> Dict:
+        """발행기 상태 정보 반환"""
+        return {
+            'published': self.published_count,
+            'flushed': self.flushed_count,
+            'conflated': self.published_count - self.flushed_count,
+            'default_interval': self.default_interval,
+            'topic_intervals': dict(self.topic_intervals)
+        }
+
+# 싱글톤 인스턴스
+realtime_publisher = RealtimePublisher()
@@ -0,0 +1,45 @@
+# app/services/reference_cache.py
+import logging
+import os
+from typing import Iterable, Optional
+from app.utils.ttl_cache import TTLCache
+from app.services.event_bus import event_bus, TOPIC_REFERENCE_CHANGED
+from app.services.data_versions import data_versions, new_version
+
+logger = logging.getLogger(__name__)
+
+# flow_info / camera_info 조회 결과 캐시 (관리자 수정 시 무효화)
+reference_cache = TTLCache(
+    maxsize=int(os.getenv("REFERENCE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+)
+
+# 캐시 키
+MONITORING_POINTS_KEY = ("monitoring_points",)
+
+def flow_info_key(flow_uid: int) -> tuple:
+    return ("flow_info", flow_uid)
+
+def cameras_key(flow_uid: int) -> tuple:
+    return ("cameras", flow_uid)
+
+
+async def invalidate_reference(flow_uids: Iterable[Optional[int]]):
+    """지점/카메라 변경 알림 - 이벤트 버스를 통해 모든 워커의 캐시 무효화"""
+    payload = {
+        "flow_uids": sorted({uid for uid in flow_uids if uid is not None}),
+        "version": new_version()
+    }
+    # 이 워커는 즉시 무효화 (다른 워커는 이벤트 수신 시 무효화)
+    await on_reference_changed(payload)
+    await data_versions.on_reference_changed(payload)
+    await event_bus.publish(TOPIC_REFERENCE_CHANGED, payload)
+
+
+async def on_reference_changed(payload: dict):
+    """이벤트 버스로 수신한 변경 알림 처리 (이 워커의 캐시 무효화)"""
+    for flow_uid in payload.get("flow_uids", []):
+        reference_cache.invalidate(flow_info_key(flow_uid))
+        reference_cache.invalidate(cameras_key(flow_uid))
+    reference_cache.invalidate(MONITORING_POINTS_KEY)
+    logger.debug(f"참조 데이터 캐시 무효화: {payload}")
@@ -0,0 +1,154 @@
+# app/services/status_monitor.py
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from app.database import get_db_pool
+from app.services.ai_data_buffer import ai_data_buffer
+
+logger = logging.getLogger(__name__)
+
+APP_VERSION = "1.0.0"
+
+
+class StatusMonitor:
+    """시스템 상태 스냅샷을 주기적으로 갱신하여 메모리에 보관
+
+    /api/status, /api/health 등 상태 조회는 요청마다 DB를 조회하지 않고 이 스냅샷을 반환한다.
+    로드밸런서/업타임 체크가 자주 호출해도 DB 부하는 갱신 주기로 제한된다.
+    """
+
+    def __init__(self, flow_uid: int = 1):
+        self.flow_uid = flow_uid
+        self.interval = float(os.getenv("STATUS_REFRESH_INTERVAL", "10"))
+        # 마지막 갱신이 이 시간(초)보다 오래되면 준비되지 않은 것으로 판단
+        self.stale_after = float(os.getenv("STATUS_STALE_AFTER", str(self.interval * 3)))
+
+        self.snapshot: Dict = {}
+        self.refreshed_at: Optional[float] = None  # time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self.inflight: Optional[asyncio.Task] = None  # 진행 중인 갱신 (동시 호출은 이 결과를 함께 기다림)
+        self.refresh_count = 0
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        if self.inflight and not self.inflight.done():
+            self.inflight.cancel()
+        self.inflight = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self._refresh_shared()
+            except Exception as e:
+                logger.error(f"시스템 상태 갱신 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _check_database(self) -> Dict:
+        """DB 연결 확인 및 카메라 수 조회 (쿼리 1회)"""
+        db_pool = get_db_pool()
+        if db_pool is None:
+            return {"healthy": False, "error": "DB 풀이 초기화되지 않았습니다"}
+
+        started = time.perf_counter()
+        try:
+            async with db_pool.acquire() as conn:
+                camera_count = await conn.fetchval(
+                    "SELECT COUNT(*) FROM camera_info WHERE flow_uid = $1", self.flow_uid
+                )
+            return {
+                "healthy": True,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "pool_size": db_pool.get_size(),
+                "pool_idle": db_pool.get_idle_size(),
+                "pool_max": db_pool.get_max_size(),
+                "camera_count": camera_count
+            }
+        except Exception as e:
+            return {"healthy": False, "error": str(e)}
+
+    async def refresh(self) -> Dict:
+        """상태 스냅샷 갱신 (각 항목은 독립적으로 실패 처리)"""
+        from app.services.ai_client import ai_client
+        from app.services.flow_service import FlowService
+
+        service = FlowService(self.flow_uid)
+        database, latest_data, flow_info = await asyncio.gather(
+            self._check_database(),
+            service.get_latest_flow_data(),
+            service.get_flow_info(),
+            return_exceptions=True
+        )
+        if isinstance(database, Exception):
+            database = {"healthy": False, "error": str(database)}
+        if isinstance(latest_data, Exception):
+            latest_data = {}
+        if isinstance(flow_info, Exception):
+            flow_info = {}
+
+        try:
+            ai_connected = ai_client.is_connected()
+        except Exception:
+            ai_connected = False
+
+        self.snapshot = {
+            "ai_connected": ai_connected,
+            "buffer": ai_data_buffer.get_buffer_status(),
+            "database": database,
+            "camera_count": database.get("camera_count", 0),
+            "last_data_time": latest_data.get("flow_time"),
+            "current_level": latest_data.get("flow_waterlevel", 0),
+            "data_status": latest_data.get("status"),
+            "flow_name": flow_info.get("flow_name"),
+            "updated_at": datetime.now().isoformat()
+        }
+        self.refreshed_at = time.monotonic()
+        self.refresh_count += 1
+        return self.snapshot
+
+    def _refresh_shared(self) -> asyncio.Task:
+        """진행 중인 갱신이 있으면 그 작업을 반환하고, 없으면 새로 시작"""
+        if self.inflight is None or self.inflight.done():
+            self.inflight = asyncio.create_task(self.refresh())
+        return self.inflight
+
+    async def get_snapshot(self) -> Dict:
+        """현재 스냅샷 반환
+
+        아직 한 번도 갱신되지 않았으면 첫 갱신을 기다리며, 동시에 들어온 요청과 시작 시 갱신 루프는
+        같은 갱신 한 번을 공유한다 (기동 직후 상태 조회가 몰려도 DB 조회는 한 번).
+        """
+        if self.refreshed_at is None:
+            # 요청이 취소되어도 공유 중인 갱신은 계속 진행
+            await asyncio.shield(self._refresh_shared())
+        return self.snapshot
+
+    def is_ready(self) -> bool:
+        """최근 스냅샷 기준 요청 처리 가능 여부 (DB 정상 + 스냅샷 최신)"""
+        if self.refreshed_at is None:
+            return False
+        fresh = time.monotonic() - self.refreshed_at <= self.stale_after
+        return fresh and self.snapshot.get("database", {}).get("healthy", False)
+
+    def get_stats(self) -> Dict:
+        return {
+            'refresh_interval': self.interval,
+            'refresh_count': self.refresh_count,
+            'age_seconds': round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None
+        }
+
+# 싱글톤 인스턴스
+status_monitor = StatusMonitor()
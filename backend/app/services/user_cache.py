@@ -0,0 +1,33 @@
+# app/services/user_cache.py
+import logging
+import os
+from app.utils.ttl_cache import TTLCache
+from app.services.event_bus import event_bus, TOPIC_USER_CHANGED
+
+logger = logging.getLogger(__name__)
+
+# 인증된 사용자 정보 캐시 (user_uid -> 사용자 정보, 사용자 수정/삭제/비밀번호 변경 시 무효화)
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60"))
+)
+
+# 서명 검증을 마친 JWT 캐시 (토큰 -> payload, 토큰 만료 시각을 넘겨 보관하지 않음)
+token_cache = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", "300"))
+)
+
+
+async def invalidate_user(user_uid: int):
+    """사용자 변경 알림 - 이벤트 버스를 통해 모든 워커의 캐시 무효화"""
+    payload = {"user_uid": user_uid}
+    # 이 워커는 즉시 무효화 (다른 워커는 이벤트 수신 시 무효화)
+    await on_user_changed(payload)
+    await event_bus.publish(TOPIC_USER_CHANGED, payload)
+
+
+async def on_user_changed(payload: dict):
+    """이벤트 버스로 수신한 사용자 변경 알림 처리 (이 워커의 캐시 무효화)"""
+    user_cache.invalidate(payload.get("user_uid"))
+    logger.debug(f"사용자 캐시 무효화: {payload}")
@@ -3,6 +3,7 @@ import json
 from datetime import datetime
 from typing import Dict, Optional, Any
 from app.database import get_db_pool
+from app.services.audit_writer import audit_writer
 
 class AuditLogger:
     """감사 로그 시스템 - 개인정보보호법 준수"""
@@ -34,7 +35,7 @@ class AuditLogger:
         resource: Optional[str] = None
     ) -> bool:
         """
-        감사 로그 기록
+        감사 로그 기록 (백그라운드 기록기 버퍼에 추가, DB 기록은 기다리지 않음)
         Args:
             event_type: 이벤트 타입
             user_id: 사용자 ID
@@ -45,25 +46,13 @@ class AuditLogger:
             resource: 접근한 리소스
         """
         try:
-            db_pool = get_db_pool()
+            # 개인정보 마스킹
+            masked_details = AuditLogger._mask_sensitive_data(details or {})
             
-            async with db_pool.acquire() as conn:
-                await AuditLogger._ensure_audit_table_exists(conn)
-                
-                # 개인정보 마스킹
-                masked_details = AuditLogger._mask_sensitive_data(details or {})
-                
-                await conn.execute("""
-                    INSERT INTO audit_logs (
-                        event_type, user_id, ip_address, user_agent,
-                        details, level, resource, created_at
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                """, 
+            audit_writer.enqueue(
                 event_type, user_id, ip_address, user_agent,
-                json.dumps(masked_details, ensure_ascii=False), 
-                level, resource, datetime.now()
-                )
-                
+                masked_details, level, resource
+            )
             return True
             
         except Exception as e:
@@ -127,37 +116,6 @@ class AuditLogger:
             level=AuditLogger.SECURITY
         )
     
-    @staticmethod
-    async def _ensure_audit_table_exists(conn):
-        """감사 로그 테이블 생성"""
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id SERIAL PRIMARY KEY,
-                event_type VARCHAR(100) NOT NULL,
-                user_id VARCHAR(100),
-                ip_address INET,
-                user_agent TEXT,
-                details JSONB,
-                level VARCHAR(20) DEFAULT 'INFO',
-                resource VARCHAR(200),
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        
-        # 인덱스 생성
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_audit_user_time ON audit_logs(user_id, created_at)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_audit_ip_time ON audit_logs(ip_address, created_at)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_audit_event_type ON audit_logs(event_type)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_audit_created_at ON audit_logs(created_at)
-        """)
-    
     @staticmethod
     def _mask_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
         """민감 정보 마스킹"""
@@ -228,4 +186,48 @@ class AuditLogger:
                 
         except Exception as e:
             print(f"감사 로그 조회 실패: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    @staticmethod
+    async def get_audit_statistics(start_date: datetime) -> Dict[str, Any]:
+        """감사 로그 통계 (DB에서 한 번에 집계 - 기간 내 전체 로그 기준)"""
+        db_pool = get_db_pool()
+        
+        async with db_pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                WITH scoped AS (
+                    SELECT event_type, level, user_id, ip_address, created_at
+                    FROM audit_logs
+                    WHERE created_at >= $1
+                ),
+                by_type AS (
+                    SELECT event_type, COUNT(*) AS cnt FROM scoped GROUP BY event_type
+                ),
+                by_level AS (
+                    SELECT COALESCE(level, 'UNKNOWN') AS level, COUNT(*) AS cnt FROM scoped GROUP BY 1
+                ),
+                by_day AS (
+                    SELECT date_trunc('day', created_at)::date AS day, COUNT(*) AS cnt FROM scoped GROUP BY 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM scoped) AS total_events,
+                    (SELECT COUNT(DISTINCT user_id) FROM scoped) AS unique_users,
+                    (SELECT COUNT(DISTINCT ip_address) FROM scoped) AS unique_ips,
+                    (SELECT COALESCE(json_object_agg(event_type, cnt), '{}') FROM by_type) AS by_event_type,
+                    (SELECT COALESCE(json_object_agg(level, cnt), '{}') FROM by_level) AS by_level,
+                    (SELECT COALESCE(json_object_agg(day, cnt ORDER BY day), '{}') FROM by_day) AS daily_events
+            """, start_date)
+        
+        by_event_type = json.loads(row['by_event_type'])
+        by_level = json.loads(row['by_level'])
+        return {
+            "total_events": row['total_events'],
+            "login_success": by_event_type.get(AuditLogger.LOGIN_SUCCESS, 0),
+            "login_failure": by_event_type.get(AuditLogger.LOGIN_FAILURE, 0),
+            "security_events": by_level.get(AuditLogger.SECURITY, 0),
+            "unique_users": row['unique_users'],
+            "unique_ips": row['unique_ips'],
+            "by_event_type": by_event_type,
+            "by_level": by_level,
+            "daily_events": json.loads(row['daily_events'])
+        }
@@ -1,7 +1,12 @@
+import asyncio
 import bcrypt
 import jwt
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
+from fastapi import HTTPException
 from app.config import settings
 
 def hash_password(password: str) -> str:
@@ -12,6 +17,81 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+class PasswordHasher:
+    """bcrypt 전용 스레드 풀 (이벤트 루프를 막지 않도록 해시/검증을 별도 스레드에서 수행)
+
+    동시에 실행되는 bcrypt 작업은 BCRYPT_WORKERS개로 제한되고,
+    대기 중인 작업이 BCRYPT_MAX_PENDING개를 넘으면 즉시 503으로 거절한다 (로그인 폭주 시 보호).
+    """
+
+    def __init__(self):
+        self.max_workers = int(os.getenv("BCRYPT_WORKERS", "2"))
+        self.max_pending = int(os.getenv("BCRYPT_MAX_PENDING", "32"))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+
+        # 통계
+        self.completed = 0
+        self.rejected = 0
+        self.peak_pending = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"}
+            )
+
+        def job():
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        queued = time.perf_counter()
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self.executor, job)
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.total_wait_ms += (started - queued) * 1000
+        self.total_run_ms += (finished - started) * 1000
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def get_stats(self) -> Dict:
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self.pending,
+            'peak_pending': self.peak_pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'avg_wait_ms': round(self.total_wait_ms / self.completed, 1) if self.completed else 0.0,
+            'avg_run_ms': round(self.total_run_ms / self.completed, 1) if self.completed else 0.0
+        }
+
+# 싱글톤 인스턴스
+password_hasher = PasswordHasher()
+
+async def hash_password_async(password: str) -> str:
+    """비밀번호 해시화 (bcrypt 스레드 풀)"""
+    return await password_hasher.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호 검증 (bcrypt 스레드 풀)"""
+    return await password_hasher.verify(plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT 토큰 생성"""
     to_encode = data.copy()
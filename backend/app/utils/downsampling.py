@@ -0,0 +1,49 @@
+# app/utils/downsampling.py
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링 - 선택된 원본 인덱스 반환
+
+    첫/마지막 점은 항상 유지하고, 나머지 구간을 n_out - 2개 버킷으로 나눠
+    직전 선택점 / 현재 버킷 후보 / 다음 버킷 평균이 이루는 삼각형 면적이 가장 큰 점을 고른다.
+    버킷 평균과 버킷 내 면적 계산은 numpy로 벡터화되어 있고, 직전 선택점에 의존하는
+    버킷 순회만 n_out번 반복한다.
+
+    Args:
+        x: 정렬된 x 값 (예: epoch 초)
+        y: y 값
+        n_out: 목표 점 개수
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 내부 점 [1, n-1)을 n_out - 2개 버킷으로 분할 (n > n_out 이므로 빈 버킷 없음)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+
+    # 버킷별 평균 (다음 버킷 평균 계산용), 마지막 버킷의 "다음"은 마지막 점
+    avg_x = np.append(np.add.reduceat(x[:n - 1], starts) / sizes, x[n - 1])
+    avg_y = np.append(np.add.reduceat(y[:n - 1], starts) / sizes, y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
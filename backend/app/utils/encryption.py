@@ -1,39 +1,55 @@
 # app/utils/encryption.py
 import os
 import base64
+import threading
+from functools import lru_cache
+from typing import Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import hashlib
 import secrets
 
+@lru_cache(maxsize=8)
+def _derive_key(password: str, salt: str) -> bytes:
+    """패스워드에서 암호화 키 생성 (PBKDF2 10만 회 - (패스워드, 솔트)별로 한 번만 계산)"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt.encode(),
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
 class DataEncryption:
-    """데이터 암호화 유틸리티 - 개인정보보호법 준수"""
+    """데이터 암호화 유틸리티 - 개인정보보호법 준수
+    
+    키 생성(PBKDF2)은 서버 시작 시가 아니라 처음 암호화/복호화할 때 수행된다.
+    """
     
-    def __init__(self, password: str = None):
+    def __init__(self, password: str = None, salt: str = None):
         """
         Args:
             password: 암호화 키 생성용 패스워드 (환경변수에서 가져옴)
+            salt: 키 생성용 솔트 (환경변수에서 가져옴)
         """
-        if not password:
-            password = os.getenv("ENCRYPTION_KEY", "default-key-change-in-production")
-        
-        self.key = self._derive_key(password)
-        self.cipher_suite = Fernet(self.key)
+        self.password = password or os.getenv("ENCRYPTION_KEY", "default-key-change-in-production")
+        self.salt = salt or os.getenv("ENCRYPTION_SALT", "default-salt")
+        self._cipher_suite: Optional[Fernet] = None
+        self._lock = threading.Lock()
     
-    def _derive_key(self, password: str) -> bytes:
-        """패스워드에서 암호화 키 생성"""
-        password_bytes = password.encode()
-        salt = os.getenv("ENCRYPTION_SALT", "default-salt").encode()
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
-        return key
+    @property
+    def key(self) -> bytes:
+        return _derive_key(self.password, self.salt)
+    
+    @property
+    def cipher_suite(self) -> Fernet:
+        """처음 사용할 때 키를 생성 (여러 스레드에서 동시에 호출해도 한 번만 생성)"""
+        if self._cipher_suite is None:
+            with self._lock:
+                if self._cipher_suite is None:
+                    self._cipher_suite = Fernet(self.key)
+        return self._cipher_suite
     
     def encrypt(self, data: str) -> str:
         """데이터 암호화"""
@@ -123,7 +139,7 @@ class PasswordSecurity:
         # 앞 2자리, 뒤 2자리 제외하고 마스킹
         return data[:2] + mask_char * (len(data) - 4) + data[-2:]
 
-# 전역 암호화 인스턴스
+# 전역 암호화 인스턴스 (키는 처음 사용할 때 생성)
 encryption = DataEncryption()
 
 # 개인정보 필드 정의
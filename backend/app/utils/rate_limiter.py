@@ -0,0 +1,302 @@
+# app/utils/rate_limiter.py
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Optional
+from fastapi import HTTPException, Request
+from app.config import settings
+from app.database import get_db_pool
+from app.services.event_bus import event_bus, TOPIC_LOGIN_THROTTLE
+
+logger = logging.getLogger(__name__)
+
+# login_lockouts.throttle_key 길이 (마이그레이션 v5) - 넘는 키는 해시로 줄인다
+MAX_KEY_LENGTH = 200
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """클라이언트 IP (TRUSTED_PROXIES에서 온 요청만 X-Forwarded-For 사용)
+
+    헤더는 누구나 보낼 수 있으므로, 신뢰하는 프록시를 오른쪽부터 건너뛰고 처음 나오는 주소를 사용한다.
+    """
+    peer = request.client.host if request.client else None
+    trusted = settings.TRUSTED_PROXIES
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or peer not in trusted:
+        return peer
+    for address in reversed([part.strip() for part in forwarded.split(",") if part.strip()]):
+        if address not in trusted:
+            return address
+    return peer
+
+
+class LoginThrottle:
+    """로그인 시도 제한 (메모리 기반 슬라이딩 윈도우)
+
+    - 계정: LOGIN_FAILURE_WINDOW초 안에 LOGIN_MAX_FAILURES회 실패하면 LOGIN_LOCKOUT_SECONDS초 잠금
+    - IP: 같은 윈도우 안에 LOGIN_IP_MAX_FAILURES회 실패하면 같은 시간 동안 차단
+    잠금 확인은 딕셔너리 조회 한 번이며, 잠긴 요청은 DB 조회와 bcrypt 검증 전에 거절된다.
+    check는 진행 중인 시도를 예약하므로, 동시에 들어온 시도도 합쳐서 허용 횟수를 넘지 못한다.
+    실패 기록은 LOGIN_THROTTLE_MAX_KEYS개까지만 보관한다 (넘으면 오래된 키부터 제거).
+    활성 잠금은 주기적으로 login_lockouts 테이블에 저장되어 재시작 후에도 유지되고,
+    LOGIN_THROTTLE_SHARED=true이면 실패/해제 이벤트를 이벤트 버스로 다른 워커와 공유한다.
+    """
+
+    def __init__(self):
+        self.max_failures = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+        self.ip_max_failures = int(os.getenv("LOGIN_IP_MAX_FAILURES", "20"))
+        self.window = float(os.getenv("LOGIN_FAILURE_WINDOW", "900"))
+        self.lockout_seconds = float(os.getenv("LOGIN_LOCKOUT_SECONDS", "1800"))
+        self.snapshot_interval = float(os.getenv("LOGIN_THROTTLE_SNAPSHOT_INTERVAL", "60"))
+        self.shared = os.getenv("LOGIN_THROTTLE_SHARED", "false").lower() == "true"
+        self.max_keys = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
+        # 키("user:<id>" / "ip:<주소>") -> 최근 실패 시각 (최대 허용 횟수만큼만 보관)
+        self.failures: Dict[str, Deque[float]] = {}
+        # 키 -> 잠금 해제 시각 (time.time())
+        self.locked_until: Dict[str, float] = {}
+        # 키 -> 결과가 아직 기록되지 않은 진행 중 시도 수
+        self.in_flight: Dict[str, int] = {}
+        self.dirty = False
+
+        # 이벤트 버스로 되돌아온 자기 이벤트를 구분하기 위한 워커 식별자
+        self.origin = uuid.uuid4().hex
+        self.task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.rejected = 0
+        self.lockouts = 0
+        self.evicted = 0
+        self.snapshot_count = 0
+
+    @staticmethod
+    def _key(prefix: str, value: str) -> str:
+        key = f"{prefix}:{value}"
+        if len(key) > MAX_KEY_LENGTH:
+            key = f"{prefix}:sha256:{hashlib.sha256(value.encode()).hexdigest()}"
+        return key
+
+    @staticmethod
+    def user_key(user_id: str) -> str:
+        return LoginThrottle._key("user", user_id.lower())
+
+    @staticmethod
+    def ip_key(ip_address: str) -> str:
+        return LoginThrottle._key("ip", ip_address or "")
+
+    def _limit_for(self, key: str) -> int:
+        return self.ip_max_failures if key.startswith("ip:") else self.max_failures
+
+    def _remaining_lock(self, key: str, now: float) -> float:
+        until = self.locked_until.get(key)
+        if until is None:
+            return 0
+        if until <= now:
+            del self.locked_until[key]
+            self.dirty = True
+            return 0
+        return until - now
+
+    def _recent_failures(self, key: str, now: float) -> int:
+        window = self.failures.get(key)
+        if not window:
+            return 0
+        return sum(1 for at in window if now - at <= self.window)
+
+    def check(self, user_id: str, ip_address: str):
+        """잠긴 계정/IP이면 429 예외 발생, 아니면 시도 1회 예약 (DB/bcrypt 이전에 호출, 끝나면 release)"""
+        now = time.time()
+        keys = (self.user_key(user_id), self.ip_key(ip_address))
+        remaining = max(self._remaining_lock(key, now) for key in keys)
+        if remaining > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"로그인 시도 횟수를 초과했습니다. {int(remaining // 60) + 1}분 후 다시 시도해주세요.",
+                headers={"Retry-After": str(int(remaining) + 1)}
+            )
+
+        # 최근 실패와 진행 중인 시도를 합쳐 한도에 닿으면 결과가 나올 때까지 거절
+        for key in keys:
+            if self._recent_failures(key, now) + self.in_flight.get(key, 0) >= self._limit_for(key):
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="처리 중인 로그인 시도가 있습니다. 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": "1"}
+                )
+        for key in keys:
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def release(self, user_id: str, ip_address: str):
+        """check에서 예약한 시도 해제 (성공/실패 기록 후 호출)"""
+        for key in (self.user_key(user_id), self.ip_key(ip_address)):
+            count = self.in_flight.get(key, 0) - 1
+            if count > 0:
+                self.in_flight[key] = count
+            else:
+                self.in_flight.pop(key, None)
+
+    def _record(self, key: str, at: float) -> bool:
+        """실패 1회 기록, 이번 실패로 잠기면 True"""
+        limit = self._limit_for(key)
+        window = self.failures.get(key)
+        if window is None:
+            if len(self.failures) >= self.max_keys:
+                # 키가 한도에 닿으면 가장 오래된 키부터 제거 (무작위 아이디 대입으로 메모리가 늘지 않도록)
+                del self.failures[next(iter(self.failures))]
+                self.evicted += 1
+            window = self.failures[key] = deque(maxlen=limit)
+        window.append(at)
+
+        # 최근 limit회의 실패가 모두 윈도우 안이면 잠금
+        if len(window) >= limit and at - window[0] <= self.window:
+            window.clear()
+            if self.locked_until.get(key, 0) < at + self.lockout_seconds:
+                self.locked_until[key] = at + self.lockout_seconds
+                self.dirty = True
+                return True
+        return False
+
+    async def record_failure(self, user_id: str, ip_address: str):
+        """로그인 실패 기록 (잠금이 걸리면 보안 이벤트 기록)"""
+        from app.utils.audit_logger import AuditLogger
+
+        now = time.time()
+        for key in (self.user_key(user_id), self.ip_key(ip_address)):
+            if self._record(key, now):
+                self.lockouts += 1
+                logger.warning(f"로그인 잠금: {key} ({int(self.lockout_seconds)}초)")
+                await AuditLogger.log_security_event(
+                    "LOGIN_LOCKOUT", ip_address,
+                    {"target": key, "user_id": user_id, "lockout_seconds": int(self.lockout_seconds)}
+                )
+
+        if self.shared:
+            await event_bus.publish(TOPIC_LOGIN_THROTTLE, {
+                "action": "failure", "origin": self.origin,
+                "user_id": user_id, "ip_address": ip_address, "at": now
+            })
+
+    async def record_success(self, user_id: str):
+        """로그인 성공 시 계정의 연속 실패 기록 초기화 (IP 기록은 유지)"""
+        self.failures.pop(self.user_key(user_id), None)
+        if self.shared:
+            await event_bus.publish(TOPIC_LOGIN_THROTTLE, {
+                "action": "success", "origin": self.origin, "user_id": user_id
+            })
+
+    async def on_throttle_event(self, payload: dict):
+        """이벤트 버스로 수신한 다른 워커의 로그인 결과 반영"""
+        if payload.get("origin") == self.origin:
+            return
+        user_id = payload.get("user_id", "")
+        if payload.get("action") == "success":
+            self.failures.pop(self.user_key(user_id), None)
+        elif payload.get("action") == "failure":
+            at = float(payload.get("at", time.time()))
+            self._record(self.user_key(user_id), at)
+            self._record(self.ip_key(payload.get("ip_address", "")), at)
+
+    # ---------------- 스냅샷 ----------------
+
+    def start(self):
+        if self.task and not self.task.done():
+            return
+        self.task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        try:
+            await self.save_snapshot()
+        except Exception as e:
+            logger.error(f"로그인 잠금 스냅샷 저장 실패: {e}")
+
+    async def _snapshot_loop(self):
+        try:
+            await self.load_snapshot()
+        except Exception as e:
+            logger.error(f"로그인 잠금 스냅샷 불러오기 실패: {e}")
+
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self._prune(time.time())
+            try:
+                await self.save_snapshot()
+            except Exception as e:
+                logger.error(f"로그인 잠금 스냅샷 저장 실패: {e}")
+
+    def _prune(self, now: float):
+        """윈도우를 벗어난 실패 기록과 만료된 잠금 정리 (메모리 제한)"""
+        for key in [k for k, window in self.failures.items() if not window or now - window[-1] > self.window]:
+            del self.failures[key]
+        for key in [k for k, until in self.locked_until.items() if until <= now]:
+            del self.locked_until[key]
+            self.dirty = True
+
+    async def load_snapshot(self):
+        """저장된 활성 잠금 불러오기 (서버 재시작 후에도 잠금 유지)"""
+        db_pool = get_db_pool()
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT throttle_key, locked_until FROM login_lockouts WHERE locked_until > NOW()"
+            )
+        for row in rows:
+            until = row['locked_until'].timestamp()
+            if self.locked_until.get(row['throttle_key'], 0) < until:
+                self.locked_until[row['throttle_key']] = until
+        if rows:
+            logger.info(f"로그인 잠금 {len(rows)}건 복원")
+
+    async def save_snapshot(self):
+        """활성 잠금을 login_lockouts 테이블에 저장 (변경이 있을 때만)"""
+        if not self.dirty:
+            return
+        # 저장 중 생긴 변경은 다시 dirty로 표시되므로 먼저 내리고, 저장에 실패하면 되돌린다
+        self.dirty = False
+        records = [(key, datetime.fromtimestamp(until)) for key, until in self.locked_until.items()]
+
+        try:
+            db_pool = get_db_pool()
+            async with db_pool.acquire() as conn:
+                async with conn.transaction():
+                    if records:
+                        await conn.executemany("""
+                            INSERT INTO login_lockouts (throttle_key, locked_until, updated_at)
+                            VALUES ($1, $2, NOW())
+                            ON CONFLICT (throttle_key) DO UPDATE SET
+                                locked_until = GREATEST(login_lockouts.locked_until, EXCLUDED.locked_until),
+                                updated_at = NOW()
+                        """, records)
+                    await conn.execute("DELETE FROM login_lockouts WHERE locked_until <= NOW()")
+        except Exception:
+            self.dirty = True
+            raise
+        self.snapshot_count += 1
+
+    def get_stats(self) -> Dict:
+        now = time.time()
+        return {
+            'shared': self.shared,
+            'tracked_keys': len(self.failures),
+            'in_flight': sum(self.in_flight.values()),
+            'evicted': self.evicted,
+            'active_lockouts': sum(1 for until in self.locked_until.values() if until > now),
+            'lockouts': self.lockouts,
+            'rejected': self.rejected,
+            'snapshots': self.snapshot_count
+        }
+
+# 싱글톤 인스턴스
+login_throttle = LoginThrottle()
@@ -0,0 +1,45 @@
+# app/utils/single_flight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """동일 key의 동시 호출을 하나의 실행으로 병합 (single-flight)
+
+    먼저 들어온 호출만 실제로 실행하고, 실행 중에 들어온 같은 key의 호출은 그 결과(또는 예외)를 공유한다.
+    실행은 별도 태스크에서 진행되므로 최초 호출자가 취소되어도 대기 중인 다른 호출자에게 영향이 없다.
+    결과는 캐시하지 않으며 실행이 끝나면 key는 즉시 해제된다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # 통계
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+            self.executed += 1
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 호출자가 취소된 경우에도 예외가 회수되지 않았다는 경고가 남지 않도록 조회
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict:
+        return {
+            'in_flight': len(self._inflight),
+            'executed': self.executed,
+            'shared': self.shared
+        }
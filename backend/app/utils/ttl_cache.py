@@ -0,0 +1,75 @@
+# app/utils/ttl_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class TTLCache:
+    """TTL(만료 시간)과 최대 크기를 가진 프로세스 내 LRU 캐시
+
+    무효화할 때마다 generation이 증가한다. DB 조회 전에 generation을 기록해 두고 set에 넘기면,
+    조회 중에 무효화가 있었던 경우 오래된 값을 다시 저장하지 않는다.
+    """
+
+    MISSING = object()
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (만료 시각, 값)
+        self.generation = 0
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.stale_skips = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """캐시 조회 (없거나 만료되었으면 default 반환)"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float = None, generation: int = None) -> bool:
+        """캐시 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)
+
+        generation을 넘기면 그 이후 무효화가 있었을 때 저장하지 않고 False 반환
+        """
+        if generation is not None and generation != self.generation:
+            self.stale_skips += 1
+            return False
+        self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return True
+
+    def invalidate(self, key: Hashable):
+        """특정 항목 제거"""
+        self.generation += 1
+        self._data.pop(key, None)
+
+    def clear(self):
+        """전체 항목 제거"""
+        self.generation += 1
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict:
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_skips': self.stale_skips
+        }
@@ -0,0 +1,141 @@
+# app/utils/ws_protocol.py
+from datetime import datetime
+from typing import Dict, Any, Optional, Union
+import json
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성 - 없으면 JSON 텍스트 프레임 사용
+    msgpack = None
+
+# 프로토콜 / 인코딩
+PROTOCOL_JSON = "json"
+PROTOCOL_COMPACT = "compact"
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+# 메시지 타입 코드
+TYPE_CODES = {
+    "realtime_kpi_update": "k",
+    "alert_update": "a",
+    "system_status": "s",
+}
+
+# 필드 코드
+FIELD_CODES = {
+    "type": "y",
+    "data": "d",
+    "timestamp": "t",
+    "seq": "n",
+    "flow_uid": "f",
+    "water_level": "h",
+    "flow_velocity": "v",
+    "discharge": "q",
+    "status": "st",
+    "alert_type": "at",
+    "id": "i",
+    "ts": "ts",
+    "level": "l",
+    "message": "m",
+    "location": "lo",
+}
+
+# 직전 프레임 대비 변경 필드만 전송하는 (상태형) 메시지 타입
+DELTA_TYPES = {"realtime_kpi_update"}
+
+
+def msgpack_available() -> bool:
+    """MessagePack 사용 가능 여부"""
+    return msgpack is not None
+
+
+def _to_epoch_ms(value: Any) -> Any:
+    """ISO 문자열/datetime을 epoch milliseconds로 변환 (변환 불가 시 원본 유지)"""
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value).timestamp() * 1000)
+        except ValueError:
+            return value
+    return value
+
+
+def _compact_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """필드명을 짧은 코드로 변환"""
+    compact = {}
+    for key, value in data.items():
+        if key == "timestamp":
+            value = _to_epoch_ms(value)
+        compact[FIELD_CODES.get(key, key)] = value
+    return compact
+
+
+class CompactEncoder:
+    """클라이언트별 compact 프로토콜 인코더
+
+    - 필드명을 짧은 코드로 변환하고 타임스탬프는 epoch ms 정수로 전송
+    - 상태형 메시지(실시간 KPI)는 지점별로 직전 프레임 대비 변경된 필드만 전송
+    - encoding이 msgpack이면 바이너리 프레임, 아니면 JSON 텍스트 프레임
+    """
+
+    def __init__(self, encoding: str = ENCODING_JSON):
+        if encoding == ENCODING_MSGPACK and not msgpack_available():
+            encoding = ENCODING_JSON
+        self.encoding = encoding
+        self.last_frames: Dict[Any, Dict[str, Any]] = {}  # (type, flow_uid) -> 직전 전송 필드
+
+    def hello(self) -> Union[str, bytes]:
+        """연결 직후 전송하는 협상 결과 및 코드표"""
+        return self._serialize({
+            "type": "hello",
+            "protocol": PROTOCOL_COMPACT,
+            "encoding": self.encoding,
+            "types": TYPE_CODES,
+            "fields": FIELD_CODES,
+        })
+
+    def encode(self, message: Dict[str, Any]) -> Optional[Union[str, bytes]]:
+        """메시지를 compact 프레임으로 변환 (변경 사항이 없으면 None)"""
+        message_type = message.get("type")
+        data = message.get("data")
+
+        frame = {FIELD_CODES["type"]: TYPE_CODES.get(message_type, message_type)}
+
+        for key, value in message.items():
+            if key in ("type", "data"):
+                continue
+            # data에 자체 타임스탬프가 있으면 envelope 타임스탬프는 생략
+            if key == "timestamp" and isinstance(data, dict) and "timestamp" in data:
+                continue
+            frame.update(_compact_fields({key: value}))
+
+        if isinstance(data, dict):
+            fields = _compact_fields(data)
+
+            if message_type in DELTA_TYPES:
+                state_key = (message_type, data.get("flow_uid"))
+                previous = self.last_frames.get(state_key, {})
+                changed = {k: v for k, v in fields.items() if previous.get(k) != v}
+                if not changed:
+                    return None
+                self.last_frames[state_key] = fields
+                # 지점 식별자는 항상 포함
+                if "f" in fields:
+                    changed["f"] = fields["f"]
+                fields = changed
+
+            frame[FIELD_CODES["data"]] = fields
+        elif data is not None:
+            frame[FIELD_CODES["data"]] = data
+
+        return self._serialize(frame)
+
+    def reset(self):
+        """델타 기준 초기화 (다음 프레임은 전체 필드 전송)"""
+        self.last_frames.clear()
+
+    def _serialize(self, frame: Dict[str, Any]) -> Union[str, bytes]:
+        if self.encoding == ENCODING_MSGPACK:
+            return msgpack.packb(frame, use_bin_type=True, default=str)
+        return json.dumps(frame, ensure_ascii=False, separators=(",", ":"), default=str)
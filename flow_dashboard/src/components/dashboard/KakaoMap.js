@@ -2,8 +2,18 @@ import React, { useEffect, useState, useRef } from 'react'
 import { MapLoading } from '../common/Loading'
 import { MapError } from '../common/ErrorMessage'
 
-export default function KakaoMap({ flowInfo }) {
+// 경보 단계별 지점 마커 색상
+const STATION_COLORS = {
+  safe: '#16a34a',
+  warning: '#ca8a04',
+  danger: '#dc2626',
+  unknown: '#6b7280'
+}
+
+export default function KakaoMap({ flowInfo, flowUid, stations = [] }) {
   const mapRef = useRef(null)
+  const mapInstanceRef = useRef(null)
+  const stationOverlaysRef = useRef(new Map()) // flow_uid -> { overlay, box, name, level }
   const [isLoaded, setIsLoaded] = useState(false)
   const [loadError, setLoadError] = useState(null)
 
@@ -74,6 +84,8 @@ export default function KakaoMap({ flowInfo }) {
       }
 
       const map = new window.kakao.maps.Map(container, options)
+      mapInstanceRef.current = map
+      stationOverlaysRef.current = new Map()
       const markerPosition = new window.kakao.maps.LatLng(lat, lng)
       const marker = new window.kakao.maps.Marker({
         position: markerPosition,
@@ -151,6 +163,54 @@ export default function KakaoMap({ flowInfo }) {
     }
   }, [isLoaded, flowInfo])
 
+  // 다른 지점은 경보 단계 색상의 작은 라벨로 표시 (전체 지점 현황 API 1회 조회 결과, 지도는 다시 만들지 않음)
+  // 지점명은 textContent로만 넣고, 라벨은 flow_uid 기준으로 재사용하여 갱신 시 바뀐 값만 반영
+  useEffect(() => {
+    const map = mapInstanceRef.current
+    if (!isLoaded || !map || !flowInfo) return
+
+    const labels = stationOverlaysRef.current
+    const visible = new Set()
+
+    stations
+      .filter(station => station.flow_latitude && station.flow_longitude && station.flow_uid !== flowUid)
+      .forEach(station => {
+        visible.add(station.flow_uid)
+        const color = STATION_COLORS[station.alert_level] || STATION_COLORS.unknown
+        const position = new window.kakao.maps.LatLng(station.flow_latitude, station.flow_longitude)
+
+        let label = labels.get(station.flow_uid)
+        if (!label) {
+          const box = document.createElement('div')
+          box.style.cssText = 'background: white; border: 2px solid; border-radius: 6px; padding: 2px 6px; font-size: 11px; white-space: nowrap;'
+          const name = document.createElement('strong')
+          const level = document.createTextNode('')
+          box.appendChild(name)
+          box.appendChild(level)
+
+          const overlay = new window.kakao.maps.CustomOverlay({ content: box, position, yAnchor: 1 })
+          overlay.setMap(map)
+          label = { overlay, box, name, level }
+          labels.set(station.flow_uid, label)
+        } else {
+          label.overlay.setPosition(position)
+        }
+
+        label.box.style.borderColor = color
+        label.name.style.color = color
+        label.name.textContent = station.flow_name
+        label.level.textContent = station.flow_waterlevel !== null ? ` ${station.flow_waterlevel.toFixed(1)}cm` : ''
+      })
+
+    // 목록에서 빠진 지점 라벨 제거
+    labels.forEach((label, uid) => {
+      if (!visible.has(uid)) {
+        label.overlay.setMap(null)
+        labels.delete(uid)
+      }
+    })
+  }, [isLoaded, flowInfo, flowUid, stations])
+
   if (!isLoaded && !loadError) {
     return <MapLoading />
   }
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useMemo, useCallback } from 'react'
+import React, { useState, useEffect, useMemo, useCallback, useRef } from 'react'
 import {
   Camera, AlertTriangle, Waves, Gauge, Clock,
   RefreshCw, Menu, X, Bell, Settings,
@@ -24,6 +24,14 @@ import Panel from './dashboard/Panel'
 import KakaoMap from './dashboard/KakaoMap'
 import VideoPlayer from './dashboard/VideoPlayer'
 
+// 지점 경보 단계 표시
+const STATION_LEVEL_STYLES = {
+  safe: { label: '정상', className: 'bg-green-100 text-green-700' },
+  warning: { label: '주의', className: 'bg-yellow-100 text-yellow-700' },
+  danger: { label: '위험', className: 'bg-red-100 text-red-700' },
+  unknown: { label: '미수신', className: 'bg-gray-100 text-gray-500' }
+}
+
 // 차트 컴포넌트 메모이제이션
 const ChartsSection = React.memo(({ waterLevel, flowVelocity, discharge }) => (
   <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
@@ -206,9 +214,23 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
       }
     }
 
-    loadCameras()
+    // 카메라 목록은 대시보드 API 응답으로 받음 (카메라 설정 변경 시에만 loadCameras로 다시 조회)
     loadNotificationSettings()
-  }, [flowUid, loadCameras])
+  }, [])
+
+  // 전체 지점 현황 (지도 마커/지점 목록 - 지점 수와 관계없이 요청 1회)
+  useEffect(() => {
+    const updateStations = async () => {
+      const snapshot = await apiService.getStationsSnapshot()
+      if (snapshot && snapshot.status === 'success') {
+        setStations(snapshot.stations || [])
+      }
+    }
+
+    updateStations()
+    const stationsInterval = setInterval(updateStations, UPDATE_INTERVALS.REALTIME)
+    return () => clearInterval(stationsInterval)
+  }, [])
 
   // 설정 모달 상태
   const [showNotificationSettings, setShowNotificationSettings] = useState(false)
@@ -236,6 +258,7 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
   const [discharge, setDischarge] = useState([])
   const [alerts, setAlerts] = useState([])
   const [flowInfo, setFlowInfo] = useState(null)
+  const [stations, setStations] = useState([])
   const [realtimeData, setRealtimeData] = useState(null)
   const [connectionStatus, setConnectionStatus] = useState('connecting')
   const [videoKey, setVideoKey] = useState(0)
@@ -255,39 +278,89 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
     }
   }
 
-  // 실시간 데이터 업데이트
+  // 주기 갱신 함수가 최신 선택 위치/하천 정보를 읽기 위한 참조 (값이 바뀌어도 초기화 effect를 다시 실행하지 않음)
+  const selectedLocationRef = useRef(selectedLocation)
+  const flowInfoRef = useRef(flowInfo)
+  // 현재 화면 데이터가 조회된 위치 (이 위치로의 변경은 다시 조회하지 않음)
+  const loadedLocationRef = useRef(selectedLocation)
+
   useEffect(() => {
-    const updateRealtimeData = async () => {
-      try {
-        const realtimeResponse = await apiService.getRealtimeData(selectedLocation, flowUid)
-        if (realtimeResponse) {
-          setRealtimeData(realtimeResponse)
-          setLastUpdate(new Date())
-
-          // 연결 상태 업데이트
-          if (realtimeResponse.connection_status) {
-            setConnectionStatus(realtimeResponse.connection_status)
-          }
+    selectedLocationRef.current = selectedLocation
+  }, [selectedLocation])
+
+  useEffect(() => {
+    flowInfoRef.current = flowInfo
+  }, [flowInfo])
+
+  // 실시간 데이터 업데이트
+  const updateRealtimeData = useCallback(async () => {
+    try {
+      const realtimeResponse = await apiService.getRealtimeData(selectedLocationRef.current, flowUid)
+      if (realtimeResponse) {
+        setRealtimeData(realtimeResponse)
+        setLastUpdate(new Date())
+
+        // 연결 상태 업데이트
+        if (realtimeResponse.connection_status) {
+          setConnectionStatus(realtimeResponse.connection_status)
         }
-      } catch (error) {
-        console.error('실시간 데이터 업데이트 실패:', error)
-        setConnectionStatus('disconnected')
       }
+    } catch (error) {
+      console.error('실시간 데이터 업데이트 실패:', error)
+      setConnectionStatus('disconnected')
+    }
+  }, [flowUid])
+
+  const updateChartData = useCallback(async () => {
+    try {
+      const timeseriesResponse = await apiService.getTimeseriesData(selectedLocationRef.current, '7d', flowUid)
+      if (timeseriesResponse && timeseriesResponse.status === 'success') {
+        setWaterLevel(timeseriesResponse.waterLevel || [])
+        setFlowVelocity(timeseriesResponse.flowVelocity || [])
+        setDischarge(timeseriesResponse.discharge || [])
+      }
+    } catch (error) {
+      console.error('차트 데이터 업데이트 실패:', error)
     }
+  }, [flowUid])
 
-    const updateChartData = async () => {
-      try {
-        const timeseriesResponse = await apiService.getTimeseriesData(selectedLocation, '7d', flowUid)
-        if (timeseriesResponse && timeseriesResponse.status === 'success') {
-          setWaterLevel(timeseriesResponse.waterLevel || [])
-          setFlowVelocity(timeseriesResponse.flowVelocity || [])
-          setDischarge(timeseriesResponse.discharge || [])
-        }
-      } catch (error) {
-        console.error('차트 데이터 업데이트 실패:', error)
+  const updateTemperature = useCallback(async () => {
+    try {
+      let lat, lon
+      const info = flowInfoRef.current
+      if (info?.flow_latitude && info?.flow_longitude) {
+        lat = info.flow_latitude
+        lon = info.flow_longitude
+      }
+
+      const temperatureData = await apiService.getCurrentTemperature(lat, lon)
+      if (temperatureData) {
+        console.log('온도 갱신:', temperatureData)
+        setCurrentTemperature({ 
+          temperature: temperatureData.temperature,
+          timestamp: temperatureData.timestamp,
+          source: temperatureData.source,
+          loading: false
+        })
+      } else {
+        // API 실패 시 온도 데이터를 null로 설정
+        console.log('온도 데이터 로드 실패 - 표시 없음')
+        setCurrentTemperature({ 
+          temperature: null, 
+          loading: false 
+        })
       }
+    } catch (error) {
+      console.error('온도 데이터 업데이트 실패:', error)
+      setCurrentTemperature({ 
+        temperature: null, 
+        loading: false 
+      })
     }
+  }, [])
 
+  // 초기 데이터 로드 및 주기 갱신 (지점이 바뀔 때만 다시 실행 - 대시보드 API 1회)
+  useEffect(() => {
     const updateAlerts = async () => {
       try {
         const alertsResponse = await apiService.getAlerts()
@@ -310,45 +383,51 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
       }
     }
 
-    const updateTemperature = async () => {
-      try {
-        let lat, lon
-        if (flowInfo?.flow_latitude && flowInfo?.flow_longitude) {
-          lat = flowInfo.flow_latitude
-          lon = flowInfo.flow_longitude
+    // 초기 데이터는 대시보드 API 한 번으로 조회 (실패 시 개별 API로 조회)
+    const applyDashboardData = (dashboard) => {
+      const { realtime, timeseries, alerts: alertsData, info, cameras } = dashboard
+      if (realtime && realtime.status !== 'error') {
+        setRealtimeData(realtime)
+        setLastUpdate(new Date())
+        if (realtime.connection_status) {
+          setConnectionStatus(realtime.connection_status)
         }
-        
-        const temperatureData = await apiService.getCurrentTemperature(lat, lon)
-        if (temperatureData) {
-          console.log('온도 갱신:', temperatureData)
-          setCurrentTemperature({ 
-            temperature: temperatureData.temperature,
-            timestamp: temperatureData.timestamp,
-            source: temperatureData.source,
-            loading: false
-          })
-        } else {
-          // API 실패 시 온도 데이터를 null로 설정
-          console.log('온도 데이터 로드 실패 - 표시 없음')
-          setCurrentTemperature({ 
-            temperature: null, 
-            loading: false 
-          })
+      }
+      if (timeseries && timeseries.status === 'success') {
+        setWaterLevel(timeseries.waterLevel || [])
+        setFlowVelocity(timeseries.flowVelocity || [])
+        setDischarge(timeseries.discharge || [])
+      }
+      if (alertsData && alertsData.status === 'success') {
+        setAlerts(alertsData.alerts || [])
+      }
+      if (info && info.status === 'success') {
+        setFlowInfo(info)
+      }
+      if (cameras && cameras.status === 'success') {
+        setLocations(cameras.cameras)
+        if (cameras.cameras.length > 0) {
+          // 측정값은 지점(flow_uid) 기준이므로 첫 카메라 선택으로 다시 조회하지 않음
+          loadedLocationRef.current = cameras.cameras[0].id
+          setSelectedLocation(cameras.cameras[0].id)
         }
-      } catch (error) {
-        console.error('온도 데이터 업데이트 실패:', error)
-        setCurrentTemperature({ 
-          temperature: null, 
-          loading: false 
-        })
       }
+      return info && info.status === 'success'
     }
 
     const initData = async () => {
       setIsLoading(true)
-      await Promise.all([updateRealtimeData(), updateChartData(), updateAlerts(), updateFlowInfo()])
-      // 온도 데이터는 flowInfo 로드 후에 별도로 호출
-      await updateTemperature()
+      const dashboard = await apiService.getDashboardData(flowUid, selectedLocationRef.current, '7d')
+      let hasFlowInfo = false
+      if (dashboard) {
+        hasFlowInfo = applyDashboardData(dashboard)
+      } else {
+        await Promise.all([updateRealtimeData(), updateChartData(), updateAlerts(), updateFlowInfo(), loadCameras()])
+      }
+      // 하천 좌표가 없으면 기본 위치로 온도 조회 (좌표가 있으면 아래 좌표 변경 effect에서 조회)
+      if (!hasFlowInfo && !flowInfoRef.current) {
+        await updateTemperature()
+      }
       setIsLoading(false)
     }
 
@@ -365,7 +444,25 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
       clearInterval(temperatureInterval)
       clearInterval(statusInterval)
     }
-  }, [flowInfo?.flow_latitude, flowInfo?.flow_longitude, selectedLocation, flowUid])
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [flowUid])
+
+  // 카메라(위치) 변경 시 실시간/차트만 다시 조회
+  useEffect(() => {
+    if (selectedLocation === loadedLocationRef.current) {
+      return
+    }
+    loadedLocationRef.current = selectedLocation
+    updateRealtimeData()
+    updateChartData()
+  }, [selectedLocation, updateRealtimeData, updateChartData])
+
+  // 하천 좌표가 바뀌면 온도만 다시 조회
+  useEffect(() => {
+    if (flowInfo?.flow_latitude && flowInfo?.flow_longitude) {
+      updateTemperature()
+    }
+  }, [flowInfo?.flow_latitude, flowInfo?.flow_longitude, updateTemperature])
 
   // WebSocket 연결 및 실시간 알람 수신
   useEffect(() => {
@@ -405,14 +502,31 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
       }
     }
 
+    // 재전송 범위를 벗어난 경우에만 알람 전체 재조회
+    const handleResync = async (message) => {
+      if (message.topic !== 'alert_update') {
+        return
+      }
+      try {
+        const alertsResponse = await apiService.getAlerts()
+        if (alertsResponse && alertsResponse.status === 'success') {
+          setAlerts(alertsResponse.alerts || [])
+        }
+      } catch (error) {
+        console.error('알림 데이터 재조회 실패:', error)
+      }
+    }
+
     // 콜백 등록
     websocketService.onConnection(handleConnection)
     websocketService.onAlertUpdate(handleAlertUpdate)
+    websocketService.onResync(handleResync)
 
     // 컴포넌트 언마운트 시 정리
     return () => {
       websocketService.removeCallback('connection', handleConnection)
       websocketService.removeCallback('alert_update', handleAlertUpdate)
+      websocketService.removeCallback('resync', handleResync)
       websocketService.disconnect()
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -740,6 +854,33 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
             </div>
           )}
 
+          {/* 전체 지점 현황 */}
+          {stations.length > 0 && (
+            <div>
+              <h3 className="text-sm font-medium text-gray-700 mb-3">전체 지점 현황</h3>
+              <div className="space-y-2">
+                {stations.map((station) => (
+                  <div
+                    key={station.flow_uid}
+                    className={`flex items-center justify-between p-2 rounded-lg ${
+                      station.flow_uid === flowUid ? 'bg-blue-50' : 'bg-gray-50'
+                    }`}
+                  >
+                    <div className="text-sm">
+                      <div className="font-medium text-gray-800">{station.flow_name}</div>
+                      <div className="text-xs text-gray-500">
+                        {station.flow_waterlevel !== null ? `${station.flow_waterlevel.toFixed(1)}cm` : '데이터 없음'}
+                      </div>
+                    </div>
+                    <span className={`text-xs px-2 py-0.5 rounded ${STATION_LEVEL_STYLES[station.alert_level]?.className || STATION_LEVEL_STYLES.unknown.className}`}>
+                      {STATION_LEVEL_STYLES[station.alert_level]?.label || STATION_LEVEL_STYLES.unknown.label}
+                    </span>
+                  </div>
+                ))}
+              </div>
+            </div>
+          )}
+
           {/* 설정 메뉴 */}
           <div>
             <h3 className="text-sm font-medium text-gray-700 mb-3">설정</h3>
@@ -997,7 +1138,7 @@ export default function AICCTVFloodDashboard({ onLogout, userInfo, flowUid = 1 }
 
               <Panel title="위치 정보">
                 <div className="space-y-3">
-                  <KakaoMap flowInfo={flowInfo} />
+                  <KakaoMap flowInfo={flowInfo} flowUid={flowUid} stations={stations} />
                   <div className="text-xs text-gray-500 space-y-1">
                     <div>• {flowInfo?.flow_name || ''}</div>
                     <div>• {flowInfo?.flow_address}</div>
@@ -54,6 +54,27 @@ export const apiService = {
     }
   },
 
+  // 대시보드 초기 데이터 일괄 조회 (실시간/시계열/알람/하천 정보/카메라)
+  getDashboardData: async (flowUid = 1, locationId = 'center', timeRange = '7d') => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/dashboard/${flowUid}?location_id=${locationId}&time_range=${timeRange}`, {
+        headers: apiService.getAuthHeaders()
+      })
+      if (response.status === 401) {
+        console.warn('토큰 만료됨, 로그아웃 처리')
+        localStorage.removeItem('access_token')
+        sessionStorage.removeItem('access_token')
+        window.location.href = '/login'
+        return null
+      }
+      if (!response.ok) throw new Error(`API 호출 실패: ${response.status}`)
+      return await response.json()
+    } catch (error) {
+      console.error('대시보드 데이터 로딩 실패:', error)
+      return null
+    }
+  },
+
   // 알림 목록 가져오기
   getAlerts: async () => {
     try {
@@ -82,6 +103,20 @@ export const apiService = {
     }
   },
 
+  // 전체 지점 현황 가져오기 (지점별 최신 측정값 + 경보 단계)
+  getStationsSnapshot: async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/stations/snapshot`, {
+        headers: apiService.getAuthHeaders()
+      })
+      if (!response.ok) throw new Error(`API 호출 실패: ${response.status}`)
+      return await response.json()
+    } catch (error) {
+      console.error('전체 지점 현황 로딩 실패:', error)
+      return null
+    }
+  },
+
   // 카메라 목록 가져오기
   getCameras: async (flowUid = 1) => {
     try {
@@ -11,8 +11,25 @@ class WebSocketService {
       alert_update: [],
       system_status: [],
       realtime_kpi_update: [],
+      resync: [],
       connection: []
     };
+
+    // 스트림 재개용 상태 (재연결 시 놓친 메시지만 재전송 받음)
+    this.streamId = null;
+    this.lastSeq = {};
+  }
+
+  buildUrl() {
+    const wsUrl = API_BASE_URL.replace('http', 'ws') + '/api/ws';
+    const seqEntries = Object.entries(this.lastSeq);
+
+    if (!this.streamId || seqEntries.length === 0) {
+      return wsUrl;
+    }
+
+    const lastSeq = seqEntries.map(([topic, seq]) => `${topic}:${seq}`).join(',');
+    return `${wsUrl}?stream=${encodeURIComponent(this.streamId)}&last_seq=${encodeURIComponent(lastSeq)}`;
   }
 
   async connect() {
@@ -21,7 +38,7 @@ class WebSocketService {
       this.ws.close();
     }
 
-    const wsUrl = API_BASE_URL.replace('http', 'ws') + '/api/ws';
+    const wsUrl = this.buildUrl();
 
     console.log(`WebSocket 연결 시도: ${wsUrl}`);
 
@@ -99,8 +116,36 @@ class WebSocketService {
 
   handleMessage(message) {
     const { type } = message;
+
+    // topic별 마지막 수신 번호 기록
+    if (typeof message.seq === 'number') {
+      this.lastSeq[type] = message.seq;
+    }
     
     switch (type) {
+      case 'ping':
+        // 서버 heartbeat 응답
+        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+          this.ws.send('pong');
+        }
+        break;
+      case 'stream_info': {
+        // 같은 스트림이면 연결 이후 메시지는 모두 수신하므로 재개 기준점을 현재 번호까지 올림
+        const sameStream = this.streamId === message.stream;
+        this.streamId = message.stream;
+        // 아직 메시지를 받지 않은 topic도 현재 번호부터 이어받도록 재개 기준점 설정
+        Object.entries(message.seq || {}).forEach(([topic, seq]) => {
+          if (this.lastSeq[topic] === undefined || (sameStream && seq > this.lastSeq[topic])) {
+            this.lastSeq[topic] = seq;
+          }
+        });
+        break;
+      }
+      case 'resync_required':
+        // 재전송 범위를 벗어남 - 해당 topic은 REST API로 전체 재조회 필요
+        delete this.lastSeq[message.topic];
+        this.notifyCallbacks('resync', message);
+        break;
       case 'alert_update':
         // 전체 메시지를 전달 (alert_type, data 포함)
         this.notifyCallbacks('alert_update', message);
@@ -162,6 +207,10 @@ class WebSocketService {
     this.callbacks.realtime_kpi_update.push(callback);
   }
 
+  onResync(callback) {
+    this.callbacks.resync.push(callback);
+  }
+
   // 콜백 제거
   removeCallback(type, callback) {
     const index = this.callbacks[type].indexOf(callback);